@@ -0,0 +1,95 @@
+"""
+Benchmarks the questions/answers TSV loaders: import cost and per-row parse
+cost of qa_io (csv module) against the previous pandas + iterrows path.
+
+    python benchmarks/bench_loaders.py --rows 100000
+"""
+import argparse
+import csv
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+SRC = BASE / "src"
+sys.path.insert(0, str(SRC))
+
+from clarify_pr.qa_io import load_answers_any, load_questions_tsv, parse_answers_wide, parse_multiline_questions  # noqa: E402
+
+
+def pandas_load_questions(path):
+    import pandas as pd
+    df = pd.read_csv(path, sep="\t", dtype=str).fillna("")
+    return {str(row["id"]): {"pr_title": row["pr_title"],
+                             "questions": parse_multiline_questions(row["clarify_questions"])}
+            for _, row in df.iterrows()}
+
+
+def pandas_load_answers(path):
+    import pandas as pd
+    df = pd.read_csv(path, sep="\t", dtype=str).fillna("")
+    return {str(row["id"]): parse_answers_wide(row["answers"]) for _, row in df.iterrows()}
+
+
+def write_fixtures(tmp: Path, rows: int):
+    qs, ans = tmp / "questions.tsv", tmp / "answers.tsv"
+    with open(qs, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter="\t")
+        w.writerow(["id", "pr_title", "clarify_questions"])
+        for i in range(rows):
+            w.writerow([i, f"PR {i}", f"Q1: What does case {i} cover?\nQ2: Which envs are affected?"])
+    with open(ans, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter="\t")
+        w.writerow(["id", "pr_title", "answers"])
+        for i in range(rows):
+            w.writerow([i, f"PR {i}", f"A1: Only case {i}\nA2: Staging only"])
+    return qs, ans
+
+
+def import_time(stmt: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", stmt], cwd=SRC, check=True, capture_output=True)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    args = ap.parse_args()
+
+    try:
+        import pandas  # noqa: F401
+        have_pandas = True
+    except ImportError:
+        have_pandas = False
+
+    print(f"startup (best of 3, incl. interpreter)\tqa_io={import_time('import clarify_pr.qa_io'):.3f}s", end="")
+    print(f"\tpandas={import_time('import pandas'):.3f}s" if have_pandas else "\tpandas=n/a")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        qs, ans = write_fixtures(Path(tmp), args.rows)
+        for name, new, old, path in [
+            ("questions", load_questions_tsv, pandas_load_questions, qs),
+            ("answers", load_answers_any, pandas_load_answers, ans),
+        ]:
+            t_new = timed(new, path)
+            line = f"{name} ({args.rows} rows)\tqa_io={t_new:.3f}s ({t_new / args.rows * 1e6:.2f} us/row)"
+            if have_pandas:
+                t_old = timed(old, path)
+                line += f"\tpandas={t_old:.3f}s ({t_old / args.rows * 1e6:.2f} us/row)\tspeedup={t_old / t_new:.1f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Offline throughput benchmark for baseline.py, clarified.py and compare_reviews.py.
+
+Builds a synthetic PR corpus from the data/pr_examples.jsonl templates, runs each
+stage in a fresh process against the fake model backend (no API key needed), and
+reports records/sec, model calls, peak RSS and p50/p99 per-call model latency.
+
+    python benchmarks/bench_pipeline.py --rows 1000 10000 --concurrency 16 \
+        --model "fake:latency_ms=200,error_rate=0"
+    python benchmarks/bench_pipeline.py --rows 2000 --model "fake:latency_ms=200,straggler_rate=0.01,straggler_ms=20000" \
+        --run_args "--hedge --deadline_s 30"
+    python benchmarks/bench_pipeline.py --rows 2000 --run_args "--pack 4"   # calls drop to ~rows/4
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing as mp
+import resource
+import runpy
+import shlex
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+SRC = BASE / "src"
+TEMPLATES = BASE / "data" / "pr_examples.jsonl"
+QUESTION_TEMPLATES = BASE / "results" / "questions.tsv"
+ANSWER_TEMPLATES = BASE / "results" / "answers.tsv"
+sys.path.insert(0, str(SRC))
+
+from clarify_pr.metrics import percentile  # noqa: E402
+
+
+def build_corpus(workdir: Path, rows: int):
+    """
+    Writes prs.jsonl, questions.tsv and answers.tsv with `rows` records.
+    Each record cycles through the templates with a unique suffix so no two
+    prompts are identical.
+    """
+    from clarify_pr.io_utils import iter_jsonl, iter_tsv
+
+    prs = list(iter_jsonl(str(TEMPLATES)))
+    questions = {r["id"]: r for r in iter_tsv(str(QUESTION_TEMPLATES))}
+    answers = {r["id"]: r for r in iter_tsv(str(ANSWER_TEMPLATES))}
+
+    with open(workdir / "prs.jsonl", "w", encoding="utf-8") as fp, \
+         open(workdir / "questions.tsv", "w", newline="", encoding="utf-8") as fq, \
+         open(workdir / "answers.tsv", "w", newline="", encoding="utf-8") as fa:
+        wq = csv.writer(fq, delimiter="\t")
+        wa = csv.writer(fa, delimiter="\t")
+        wq.writerow(["id", "pr_title", "clarify_questions"])
+        wa.writerow(["id", "pr_title", "answers"])
+        for i in range(rows):
+            tpl = prs[i % len(prs)]
+            tid = str(tpl["id"])
+            fp.write(json.dumps({"id": i, "prompt": f"{tpl['prompt']}\n(ref #{i})"}) + "\n")
+            q = questions.get(tid, {})
+            a = answers.get(tid, {})
+            wq.writerow([i, q.get("pr_title", ""), q.get("clarify_questions", "")])
+            wa.writerow([i, a.get("pr_title", ""), a.get("answers", "")])
+
+
+def _run_stage(module: str, argv: list, out: mp.Queue, metrics_path: Path | None = None):
+    sys.argv = [module] + argv
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        runpy.run_module(f"clarify_pr.{module}", run_name="__main__", alter_sys=True)
+    elapsed = time.perf_counter() - t0
+    if metrics_path is not None and metrics_path.exists():
+        # per call as the pipeline saw it, including retries, deadlines and hedges
+        with metrics_path.open(encoding="utf-8") as f:
+            latencies = [json.loads(line)["latency_s"] for line in f]
+    else:
+        fake_model = sys.modules.get("clarify_pr.fake_model")
+        latencies = list(fake_model.CALL_LOG) if fake_model else []
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put({"elapsed": elapsed, "peak_rss_mb": peak_kb / 1024, "latencies": latencies})
+
+
+def run_stage(module: str, argv: list, metrics_path: Path | None = None) -> dict:
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_run_stage, args=(module, argv, q, metrics_path))
+    p.start()
+    res = q.get()
+    p.join()
+    if p.exitcode:
+        raise RuntimeError(f"{module} exited with {p.exitcode}")
+    return res
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline pipeline benchmark with a simulated Gemini backend.")
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000], help="Corpus sizes to benchmark")
+    ap.add_argument("--model", default="fake:latency_ms=200", help="fake model spec (see src/clarify_pr/fake_model.py)")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--stages", default="baseline,clarified,compare")
+    ap.add_argument("--run_args", default="",
+                    help="Extra flags for the model stages, e.g. \"--hedge --deadline_s 30\"")
+    ap.add_argument("--json", help="Also write results as JSON to this path")
+    args = ap.parse_args()
+    run_args = shlex.split(args.run_args)
+
+    stages = args.stages.split(",")
+    results = []
+    print("rows\tstage\tseconds\trecords/s\tcalls\tpeak_rss_mb\tp50_ms\tp99_ms")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+            work = Path(tmp)
+            build_corpus(work, rows)
+            argvs = {
+                "baseline": ("baseline", [
+                    "--input", str(work / "prs.jsonl"), "--output", str(work / "baseline.jsonl"),
+                    "--model", args.model, "--concurrency", str(args.concurrency), "--no_cache",
+                    "--metrics_out", str(work / "baseline.metrics.jsonl"), *run_args,
+                ]),
+                "clarified": ("clarified", [
+                    "--input", str(work / "prs.jsonl"), "--questions", str(work / "questions.tsv"),
+                    "--answers", str(work / "answers.tsv"), "--output", str(work / "clarified.jsonl"),
+                    "--review_model", args.model, "--concurrency", str(args.concurrency), "--no_cache",
+                    "--metrics_out", str(work / "clarified.metrics.jsonl"), *run_args,
+                ]),
+                "compare": ("compare_reviews", [
+                    "--baseline", str(work / "baseline.jsonl"), "--clarified", str(work / "clarified.jsonl"),
+                    "--output", str(work / "comparison.tsv"),
+                ]),
+            }
+            for stage in stages:
+                module, argv = argvs[stage]
+                res = run_stage(module, argv, work / f"{stage}.metrics.jsonl")
+                lat = res["latencies"]
+                row = {
+                    "rows": rows,
+                    "stage": stage,
+                    "seconds": res["elapsed"],
+                    "records_per_s": rows / res["elapsed"] if res["elapsed"] else float("nan"),
+                    # one per model call, so --pack shows up here
+                    "calls": len(lat),
+                    "peak_rss_mb": res["peak_rss_mb"],
+                    "p50_ms": percentile(lat, 50) * 1000,
+                    "p99_ms": percentile(lat, 99) * 1000,
+                }
+                results.append(row)
+                print(f"{rows}\t{stage}\t{row['seconds']:.2f}\t{row['records_per_s']:.1f}\t{row['calls']}\t"
+                      f"{row['peak_rss_mb']:.1f}\t{row['p50_ms']:.1f}\t{row['p99_ms']:.1f}", flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
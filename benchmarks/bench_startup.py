@@ -0,0 +1,72 @@
+"""
+Cold-start benchmark for the `clarify-pr` CLI: wall time of `--help` for the
+entry point and every subcommand, each in a fresh interpreter, minus the
+time of a bare `python -c pass`. Subcommands load their module (and nothing
+heavy) for --help, so this is the fixed cost every run pays before work.
+
+    python benchmarks/bench_startup.py --target_ms 100 --check
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+SRC = BASE / "src"
+sys.path.insert(0, str(SRC))
+
+from clarify_pr.cli import COMMANDS  # noqa: E402
+
+# modules that must never be imported just to start a command
+HEAVY = ("numpy", "pandas", "pyarrow", "matplotlib", "torch", "transformers", "google.generativeai", "asyncio")
+
+
+def startup_ms(args: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=SRC, check=True, capture_output=True)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def heavy_imports(command: str) -> list:
+    """
+    Heavy modules loaded by `clarify-pr <command> --help` (via -X importtime).
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "clarify_pr.cli", command, "--help"],
+                          cwd=SRC, check=True, capture_output=True, text=True)
+    loaded = {line.rsplit("|", 1)[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+    return [m for m in HEAVY if m in loaded]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per command; the best is reported")
+    ap.add_argument("--target_ms", type=float, default=100, help="Cold-start budget over a bare interpreter")
+    ap.add_argument("--commands", default=",".join(COMMANDS), help="Comma-separated subset of subcommands")
+    ap.add_argument("--check", action="store_true", help="Exit non-zero if any command is over the target")
+    args = ap.parse_args()
+
+    bare = startup_ms(["-c", "pass"], args.repeat)
+    print(f"bare interpreter\t{bare:.1f} ms (subtracted below)")
+    print("command\tstartup_ms\tover_target\theavy_imports")
+    over = []
+    for name in [""] + [c for c in args.commands.split(",") if c]:
+        argv = ["-m", "clarify_pr.cli", name, "--help"] if name else ["-m", "clarify_pr.cli", "--help"]
+        ms = startup_ms(argv, args.repeat) - bare
+        heavy = heavy_imports(name) if name else []
+        late = ms > args.target_ms
+        if late:
+            over.append(name or "(cli)")
+        print(f"{name or '(cli)'}\t{ms:.1f}\t{'yes' if late else 'no'}\t{','.join(heavy) or '-'}", flush=True)
+
+    if over:
+        print(f"\nover {args.target_ms:g} ms: {', '.join(over)}")
+        if args.check:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Clarifying questions before LLM code review. Each module is one pipeline
+step with a main(argv); run it as `clarify-pr <command>` or
+`python -m clarify_pr.<module>`.
+"""
@@ -0,0 +1,43 @@
+import argparse
+import csv
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[2]
+SRC = BASE / "results" / "eval.tsv"
+DST = BASE / "results" / "eval_scored.tsv"
+
+new_fields = [
+    "specificity_baseline", "specificity_clarified",
+    "actionability_baseline", "actionability_clarified",
+    "assumption_identification_baseline", "assumption_identification_clarified",
+    "comment_quality_baseline", "comment_quality_clarified",
+    "suggestions_baseline", "suggestions_clarified",
+]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write an empty eval_scored.tsv to fill in by hand.")
+    ap.add_argument("--input", default=SRC, help="eval.tsv with id and pr_title")
+    ap.add_argument("--output", default=DST, help="Where to write the scoring sheet")
+    args = ap.parse_args(argv)
+
+    with open(args.input, encoding="utf-8") as fin:
+        r = csv.DictReader(fin, delimiter="\t")
+        rows = list(r)
+        # keep only id, pr_title, and the new fields
+        fields = ["id", "pr_title"] + new_fields
+
+    with open(args.output, "w", newline="", encoding="utf-8") as fout:
+        w = csv.DictWriter(fout, fieldnames=fields, delimiter="\t")
+        w.writeheader()
+        for row in rows:
+            clean = {"id": row.get("id", ""), "pr_title": row.get("pr_title", "")}
+            for f in new_fields:
+                clean[f] = ""
+            w.writerow(clean)
+
+    print(f"Wrote {args.output} with {len(rows)} rows and simplified fields.")
+
+
+if __name__ == "__main__":
+    main()
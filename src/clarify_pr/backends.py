@@ -0,0 +1,194 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Type
+
+BACKENDS: Dict[str, Type["Backend"]] = {}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def register_backend(name: str):
+    def deco(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return deco
+
+
+def get_backend(name: str, model_name: str, **opts) -> "Backend":
+    """
+    Returns the process-wide backend instance for (name, model_name, opts),
+    creating it on first use so clients and connections are reused.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; choose from {', '.join(sorted(BACKENDS))}")
+    key = (name, model_name, tuple(sorted(opts.items())))
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = BACKENDS[name](model_name, **opts)
+        return _instances[key]
+
+
+def parse_backend_opts(pairs: List[str]) -> dict:
+    """
+    Turns ["adapter=foo", "load_4bit=false"] into {"adapter": "foo", "load_4bit": "false"}.
+    """
+    opts = {}
+    for pair in pairs or []:
+        k, _, v = pair.partition("=")
+        opts[k.strip()] = v.strip()
+    return opts
+
+
+class TextResponse:
+    """
+    Minimal response with the .text attribute the review scripts read.
+    """
+
+    def __init__(self, text: str, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class Backend(ABC):
+    """
+    Common interface for model engines. Subclasses implement generate();
+    agenerate() and generate_many() fall back to threads unless overridden.
+    generate_content() is kept so backends are drop-in for GenerativeModel.
+    These call the engine directly: retries, rate limits, hedging and the
+    cache live in the wrappers open_model() puts around it.
+    """
+    name = ""
+
+    def __init__(self, model_name: str, **opts):
+        self.model_name = model_name
+        self.opts = opts
+
+    @abstractmethod
+    def generate(self, prompt: str, **kwargs):
+        ...
+
+    def generate_content(self, prompt: str, **kwargs):
+        return self.generate(prompt, **kwargs)
+
+    def generate_stream(self, prompt: str, **kwargs):
+        """
+        Yields response chunks with .text as they are produced. Backends
+        without streaming yield the whole response as one chunk.
+        """
+        yield self.generate(prompt, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs):
+        import asyncio  # imported here: asyncio alone adds ~40 ms to every script's startup
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
+    def generate_many(self, prompts: List[str], concurrency: int = 8, **kwargs) -> list:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            return list(pool.map(lambda p: self.generate(p, **kwargs), prompts))
+
+
+@register_backend("gemini")
+class GeminiBackend(Backend):
+    """
+    google.generativeai, configured once per process. The GenerativeModel (and
+    its underlying gRPC/REST transport) is shared by every caller.
+    opts: transport ("grpc" | "rest"); genai.configure() is global, so every
+    instance in a process must ask for the same one.
+    """
+    _configured = False
+    _transport = None
+    _configure_lock = threading.Lock()
+
+    def __init__(self, model_name: str, **opts):
+        super().__init__(model_name, **opts)
+        import google.generativeai as genai
+
+        transport = opts.get("transport") or None
+        with GeminiBackend._configure_lock:
+            if GeminiBackend._configured:
+                if transport != GeminiBackend._transport:
+                    raise ValueError(f"Gemini is already configured with transport={GeminiBackend._transport!r}; "
+                                     f"cannot switch to {transport!r} in the same process")
+            else:
+                key = os.environ.get("GEMINI_API_KEY")
+                if not key:
+                    raise RuntimeError("Missing GEMINI_API_KEY")
+                kwargs = {"api_key": key}
+                if transport:
+                    kwargs["transport"] = transport
+                genai.configure(**kwargs)
+                GeminiBackend._configured = True
+                GeminiBackend._transport = transport
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str, **kwargs):
+        return self.model.generate_content(prompt, **kwargs)
+
+    def generate_stream(self, prompt: str, **kwargs):
+        yield from self.model.generate_content(prompt, stream=True, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs):
+        return await self.model.generate_content_async(prompt, **kwargs)
+
+
+@register_backend("local-hf")
+class LocalHFBackend(Backend):
+    """
+    A local transformers causal LM (optionally with a PEFT adapter), loaded once.
+    generate_many() runs real padded batches, one at a time on the one model,
+    so it takes no concurrency; single calls are serialised. Decoding is
+    greedy; generation_config's max_output_tokens overrides max_new_tokens and
+    other keyword arguments go to model.generate().
+    opts: adapter, load_4bit (true/false), max_new_tokens, batch_size
+    """
+
+    def __init__(self, model_name: str, **opts):
+        super().__init__(model_name, **opts)
+        from .clarifier import load_model
+
+        load_4bit = str(opts.get("load_4bit", "true")).lower() not in ("0", "false", "no")
+        self.max_new_tokens = int(opts.get("max_new_tokens", 512))
+        self.batch_size = int(opts.get("batch_size", 8))
+        self.tok, self.model = load_model(model_name, opts.get("adapter") or None, load_4bit=load_4bit)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, **kwargs):
+        return self.generate_many([prompt], **kwargs)[0]
+
+    def generate_many(self, prompts: List[str], generation_config=None, **kwargs) -> list:
+        from .clarifier import bucketed_batches, generate_batch
+
+        max_new_tokens = int((generation_config or {}).get("max_output_tokens") or self.max_new_tokens)
+        texts = [""] * len(prompts)
+        with self._lock:
+            for batch in bucketed_batches(self.tok, prompts, self.batch_size):
+                outs = generate_batch(self.tok, self.model, [prompts[i] for i in batch], max_new_tokens, **kwargs)
+                for i, text in zip(batch, outs):
+                    texts[i] = text
+        return [TextResponse(t) for t in texts]
+
+
+@register_backend("stub")
+class StubBackend(Backend):
+    """
+    Offline simulated backend (fake_model.FakeModel). Options come either from
+    a "fake:k=v,..." model name or from backend opts.
+    """
+
+    def __init__(self, model_name: str, **opts):
+        super().__init__(model_name, **opts)
+        from .fake_model import FakeModel
+
+        if model_name.startswith("fake"):
+            self.model = FakeModel.from_spec(model_name)
+        else:
+            self.model = FakeModel.from_spec("fake:" + ",".join(f"{k}={v}" for k, v in opts.items()))
+
+    def generate(self, prompt: str, **kwargs):
+        return self.model.generate_content(prompt, **kwargs)
+
+    def generate_stream(self, prompt: str, **kwargs):
+        yield from self.model.stream_content(prompt, **kwargs)
@@ -0,0 +1,43 @@
+import argparse
+from .io_utils import iter_jsonl, pr_text_of
+from .run_utils import add_run_args, generate_reviews, open_model, open_output, print_stats
+from .sharding import take_shard
+
+BASELINE_PROMPT = """You are a senior code reviewer.
+Write a concise review for the following PR:
+{pr_text}
+"""
+
+
+def build_baseline_request(obj: dict):
+    """
+    Returns (prompt, record without baseline_review) for one input PR.
+    """
+    pr_text = pr_text_of(obj)
+    return BASELINE_PROMPT.format(pr_text=pr_text), {"id": str(obj.get("id")), "prompt": pr_text}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", required=True)
+    ap.add_argument("--output", required=True)
+    ap.add_argument("--model", default="gemini-1.5-flash")
+    ap.add_argument("--limit", type=int, default=None)
+    add_run_args(ap)
+    args = ap.parse_args(argv)
+
+    model = open_model(args, args.model, "baseline")
+
+    writer, done = open_output(args)
+    with writer:
+        prs = take_shard(iter_jsonl(args.input, args.limit), args.shard_index, args.shard_count)
+        todo = (obj for obj in prs if str(obj.get("id")) not in done)
+        for rec, review in generate_reviews(model, map(build_baseline_request, todo), args):
+            rec["baseline_review"] = review
+            writer.write(rec)
+
+    print_stats("BASELINE", model)
+
+
+if __name__ == "__main__":
+    main()
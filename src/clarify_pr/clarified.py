@@ -0,0 +1,114 @@
+import argparse
+from typing import Iterator, List
+
+from .gating import baseline_only_ids
+from .io_utils import iter_jsonl, pr_text_of
+from .qa_io import load_answers_any, load_questions_tsv
+from .run_utils import add_run_args, generate_reviews, open_model, open_output, print_stats
+from .sharding import take_shard
+
+REVIEW_PROMPT = """You are a senior code reviewer.
+
+PR title:
+{pr_title}
+
+PR description:
+{pr_text}
+
+Clarifying Q&A:
+{qa_block}
+
+Write specific, actionable review comments or code suggestions.
+- Be concise (bullets are fine).
+- Call out risks, tests to add, and concrete code changes.
+"""
+
+
+# I/O helpers
+def load_prs_jsonl(path: str, limit: int | None) -> Iterator[dict]:
+    return iter_jsonl(path, limit)
+
+
+def build_qa_block(numbered_questions: List[str], answers: List[str]) -> str:
+    """
+    Takes plain questions (no Q#: prefixes) and answers.
+    Returns a nicely numbered Q/A block with Q1/A1 etc.
+    """
+    lines = []
+    for i, q in enumerate(numbered_questions, start=1):
+        a = answers[i - 1] if i - 1 < len(answers) else "[no answer provided]"
+        lines.append(f"Q{i}: {q}\nA{i}: {a}")
+    return "\n\n".join(lines)
+
+
+def build_review_request(obj: dict, qmap: dict, amap: dict):
+    """
+    Returns (prompt, record without clarified_review) for one input PR,
+    or None when the PR has no id or text.
+    """
+    pid = obj.get("id")
+    pr_text = pr_text_of(obj)
+    if pid is None or pid == "" or not pr_text:
+        return None
+    pid = str(pid)
+
+    pr_title = qmap.get(pid, {}).get("pr_title", "")
+    questions = qmap.get(pid, {}).get("questions", [])
+    answers = amap.get(pid, [])
+
+    qa_block = build_qa_block(questions, answers)
+    prompt = REVIEW_PROMPT.format(
+        pr_title=pr_title or "(untitled)",
+        pr_text=pr_text,
+        qa_block=qa_block,
+    )
+    rec = {
+        "id": pid,
+        "pr_title": pr_title,
+        "pr_text": pr_text,
+        "questions": [f"Q{i+1}: {q}" for i, q in enumerate(questions)],
+        "answers": [f"A{i+1}: {a}" for i, a in enumerate(answers)],
+    }
+    return prompt, rec
+
+
+def run_review(args):
+    reviewer = open_model(args, args.review_model, "clarified")
+
+    # Inputs
+    pr_rows = take_shard(load_prs_jsonl(args.input, args.limit), args.shard_index, args.shard_count)
+    qmap = load_questions_tsv(args.questions)
+    amap = load_answers_any(args.answers)
+
+    writer, done = open_output(args, ensure_ascii=False)
+    # PRs the gate routed to baseline only have no questions to review with
+    skip = done | baseline_only_ids(args.gate)
+    todo = (obj for obj in pr_rows if str(obj.get("id")) not in skip)
+    requests = (req for req in (build_review_request(obj, qmap, amap) for obj in todo) if req is not None)
+    wrote = 0
+    with writer:
+        for rec, review in generate_reviews(reviewer, requests, args):
+            rec["clarified_review"] = review
+            writer.write(rec)
+            wrote += 1
+
+    print(f"[REVIEW] wrote {wrote} rows -> {args.output}")
+    print_stats("REVIEW", reviewer)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Clarified review (review step only).")
+    ap.add_argument("--input", required=True, help="PR JSONL with {id, pr_text|prompt}")
+    ap.add_argument("--questions", required=True, help="TSV with columns: id, pr_title, clarify_questions (newline-separated Q1/Q2)")
+    ap.add_argument("--answers", required=True, help="Answers TSV (wide: id,answers with newlines; or tall: id,answer per row)")
+    ap.add_argument("--output", required=True, help="Output JSONL for clarified reviews")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--review_model", default="gemini-1.5-flash")
+    ap.add_argument("--gate", default=None, help="Gate TSV from gating.py; PRs routed to baseline only are skipped")
+    add_run_args(ap)
+    args = ap.parse_args(argv)
+    run_review(args)
+
+
+if __name__ == "__main__":
+    main()
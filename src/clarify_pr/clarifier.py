@@ -0,0 +1,201 @@
+import argparse
+import csv
+import re
+from typing import Iterator, List
+
+from .io_utils import iter_jsonl, pr_text_of
+from .sharding import add_shard_args, take_shard
+
+BASE_MODEL = "deepseek-ai/deepseek-coder-6.7b-instruct"
+ADAPTER = "jie-jw-wu/clarify-coder"
+
+QUESTION_PROMPT = """You are analyzing an ambiguous PR description.
+Think step-by-step to find missing requirements.
+Ask only clarifying questions a reviewer would need.
+Return {k} numbered questions. Do not answer them.
+
+PR description:
+{pr_text}
+"""
+
+
+def extract_title(pr_text: str) -> str:
+    # tries to grab "PR Title: ..." from prompt format; falls back gracefully
+    m = re.search(r'PR Title:\s*(.+)', pr_text)
+    return m.group(1).strip() if m else (pr_text.splitlines() or [""])[0][:120]
+
+
+def parse_questions(completion: str, k: int) -> List[str]:
+    qs = []
+    for ln in completion.splitlines():
+        ln = ln.strip()
+        ln = re.sub(r"^[\-\*\d\.\)\s]+", "", ln)  # strip bullets/numbers
+        if ln.endswith("?") and len(ln) > 4:
+            qs.append(ln)
+    return qs[:k]
+
+
+def load_model(base: str = BASE_MODEL, adapter: str | None = ADAPTER, load_4bit: bool = True):
+    """
+    Loads the base model (4-bit when bitsandbytes is available) plus the
+    ClarifyCoder PEFT adapter. Returns (tokenizer, model) ready for batched,
+    left-padded generation.
+    """
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
+
+    load_kwargs = dict(torch_dtype=torch.float16, device_map="auto")
+    if load_4bit:
+        try:
+            import bitsandbytes  # noqa: F401
+            load_kwargs["quantization_config"] = BitsAndBytesConfig(load_in_4bit=True)
+        except Exception:
+            pass
+
+    tok = AutoTokenizer.from_pretrained(base, use_fast=True)
+    tok.padding_side = "left"
+    if tok.pad_token is None:
+        tok.pad_token = tok.eos_token
+    model = AutoModelForCausalLM.from_pretrained(base, **load_kwargs)
+    if adapter:
+        from peft import PeftModel
+        model = PeftModel.from_pretrained(model, adapter)
+    model.eval()
+    return tok, model
+
+
+def generate_batch(tok, model, prompts: List[str], max_new_tokens: int = 200,
+                   repetition_penalty: float = 1.05, **gen_kwargs) -> List[str]:
+    """
+    Greedy-decodes a padded batch of prompts and returns only the completions.
+    Extra keyword arguments go to model.generate().
+    """
+    import torch
+
+    enc = tok(prompts, return_tensors="pt", padding=True).to(model.device)
+    with torch.inference_mode():
+        out = model.generate(
+            **enc,
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            repetition_penalty=repetition_penalty,
+            pad_token_id=tok.pad_token_id,
+            **gen_kwargs,
+        )
+    completions = out[:, enc["input_ids"].shape[1]:]
+    return [s.strip() for s in tok.batch_decode(completions, skip_special_tokens=True)]
+
+
+def bucketed_batches(tok, prompts: List[str], batch_size: int) -> Iterator[List[int]]:
+    """
+    Yields batches of prompt indices grouped by token length, so each padded
+    batch wastes as little compute on padding as possible.
+    """
+    lengths = [len(ids) for ids in tok(prompts)["input_ids"]]
+    order = sorted(range(len(prompts)), key=lengths.__getitem__)
+    for i in range(0, len(order), batch_size):
+        yield order[i:i + batch_size]
+
+
+def ask_questions_window(tok, model, objs: List[dict], args) -> List[List[str]]:
+    prompts = [QUESTION_PROMPT.format(k=args.k, pr_text=pr_text_of(o)) for o in objs]
+    results = [[] for _ in objs]
+    for batch in bucketed_batches(tok, prompts, args.batch_size):
+        completions = generate_batch(tok, model, [prompts[i] for i in batch], args.max_new_tokens)
+        for i, completion in zip(batch, completions):
+            results[i] = parse_questions(completion, args.k)
+    return results
+
+
+def format_questions(qs: List[str]) -> str:
+    # newline-separated in one cell; read back by qa_io.parse_multiline_questions
+    return "\n".join([f"Q{i}: {q}" for i, q in enumerate(qs, start=1)])
+
+
+def write_window(w, objs: List[dict], questions: List[List[str]]) -> int:
+    for obj, qs in zip(objs, questions):
+        w.writerow([str(obj["id"]), extract_title(pr_text_of(obj)), format_questions(qs)])
+    return len(objs)
+
+
+def ask_deduped(ask, window: List[dict], index, known: dict) -> List[List[str]]:
+    """
+    Asks only for group representatives; near-duplicates get their
+    representative's questions (`known` keeps them across windows).
+    """
+    reps = [index.find_or_add(str(o.get("id")), pr_text_of(o))[0] for o in window]
+    fresh = [o for o, rep in zip(window, reps) if rep == str(o.get("id"))]
+    for o, qs in zip(fresh, ask(fresh) if fresh else []):
+        known[str(o.get("id"))] = qs
+    return [known[rep] for rep in reps]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate clarifying questions with ClarifyCoder (batched).")
+    ap.add_argument("--input", required=True, help="PR JSONL with {id, pr_text|prompt}")
+    ap.add_argument("--output", required=True, help="TSV with columns: id, pr_title, clarify_questions")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--k", type=int, default=2, help="Questions per PR")
+    ap.add_argument("--base_model", default=BASE_MODEL)
+    ap.add_argument("--adapter", default=ADAPTER, help="PEFT adapter ('' to disable)")
+    ap.add_argument("--no_4bit", action="store_true")
+    ap.add_argument("--batch_size", type=int, default=8)
+    ap.add_argument("--bucket_window", type=int, default=8,
+                    help="Batches worth of PRs read ahead and sorted by length before generating")
+    ap.add_argument("--max_new_tokens", type=int, default=200)
+    ap.add_argument("--server", default=None,
+                    help="URL of a running clarifier_server.py; send PRs there instead of loading the model here")
+    ap.add_argument("--dedup_threshold", type=float, default=0,
+                    help="Ask once per group of near-duplicate PRs at this MinHash similarity and reuse the questions (0 = off)")
+    ap.add_argument("--gate", default=None, help="Gate TSV from gating.py; PRs routed to baseline only get no questions")
+    add_shard_args(ap)
+    args = ap.parse_args(argv)
+
+    if args.server:
+        from .clarifier_server import ask_server
+
+        def ask(window):
+            return ask_server(args.server, window, args.k)
+    else:
+        tok, model = load_model(args.base_model, args.adapter or None, load_4bit=not args.no_4bit)
+
+        def ask(window):
+            return ask_questions_window(tok, model, window, args)
+
+    if args.dedup_threshold:
+        from .dedup import DedupIndex
+        index, known, ask_all = DedupIndex(args.dedup_threshold), {}, ask
+
+        def ask(window):
+            return ask_deduped(ask_all, window, index, known)
+
+    window_size = args.batch_size * args.bucket_window
+    wrote = 0
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_MINIMAL)
+        w.writerow(["id", "pr_title", "clarify_questions"])  # header
+
+        window = []
+        skip = set()
+        if args.gate:
+            from .gating import baseline_only_ids
+            skip = baseline_only_ids(args.gate)
+        for obj in take_shard(iter_jsonl(args.input, args.limit), args.shard_index, args.shard_count):
+            if str(obj.get("id")) in skip:
+                continue
+            window.append(obj)
+            if len(window) < window_size:
+                continue
+            wrote += write_window(w, window, ask(window))
+            f.flush()
+            window = []
+        if window:
+            wrote += write_window(w, window, ask(window))
+
+    print(f"[CLARIFY] wrote {wrote} rows -> {args.output}")
+    if args.dedup_threshold:
+        print(f"[DEDUP] {index.report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import json
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from .clarifier import (ADAPTER, BASE_MODEL, QUESTION_PROMPT, extract_title, format_questions, generate_batch,
+                       load_model, parse_questions)
+from .io_utils import pr_text_of
+
+DEFAULT_PORT = 8765
+
+
+def load_tiny_model(seed: int = 0):
+    """
+    A randomly initialised two-layer Llama with a small byte-level BPE
+    tokenizer trained on the prompt template. Runs on CPU in milliseconds;
+    for testing the server, not for real questions.
+    """
+    import torch
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    bpe = Tokenizer(models.BPE(unk_token="<unk>"))
+    bpe.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    bpe.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(vocab_size=512, special_tokens=["<unk>", "<pad>", "<eos>"],
+                                  initial_alphabet=pre_tokenizers.ByteLevel.alphabet())
+    bpe.train_from_iterator([QUESTION_PROMPT, "Which environments? Does this affect mobile clients?"], trainer)
+    tok = PreTrainedTokenizerFast(tokenizer_object=bpe, unk_token="<unk>", pad_token="<pad>", eos_token="<eos>")
+    tok.padding_side = "left"
+
+    torch.manual_seed(seed)
+    config = LlamaConfig(vocab_size=len(tok), hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+                         num_attention_heads=4, num_key_value_heads=4, max_position_embeddings=4096,
+                         pad_token_id=tok.pad_token_id, eos_token_id=tok.eos_token_id)
+    model = LlamaForCausalLM(config)
+    model.eval()
+    return tok, model
+
+
+class DynamicBatcher:
+    """
+    Collects prompts from concurrent callers and runs them through the model
+    together. A batch closes when it holds `max_batch` prompts or `max_wait_ms`
+    after its first prompt arrived, whichever comes first.
+    """
+
+    def __init__(self, tok, model, max_batch: int = 8, max_wait_ms: float = 20, max_new_tokens: int = 200):
+        self.tok = tok
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.max_new_tokens = max_new_tokens
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.prompts = 0
+        self._worker = threading.Thread(target=self._loop, daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str) -> Future:
+        fut = Future()
+        self.queue.put((prompt, fut))
+        return fut
+
+    def _collect(self) -> list:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            try:
+                outs = generate_batch(self.tok, self.model, [p for p, _ in batch], self.max_new_tokens)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.prompts += len(batch)
+            for (_, fut), text in zip(batch, outs):
+                fut.set_result(text)
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "prompts": self.prompts,
+                "mean_batch": round(self.prompts / self.batches, 2) if self.batches else 0.0}
+
+
+def make_handler(batcher: DynamicBatcher, model_label: str):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, obj: dict):
+            body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._send(404, {"error": "not found"})
+            self._send(200, {"status": "ok", "model": model_label, **batcher.stats()})
+
+        def do_POST(self):
+            """
+            POST /questions {"items": [{"id", "pr_text"}, ...], "k": 2}
+            -> {"results": [{"id", "pr_title", "questions", "clarify_questions"}, ...]}
+            """
+            if self.path != "/questions":
+                return self._send(404, {"error": "not found"})
+            try:
+                req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                items = req.get("items") or [req]
+                k = int(req.get("k", 2))
+            except (ValueError, AttributeError) as e:
+                return self._send(400, {"error": f"bad request: {e}"})
+            futures = [batcher.submit(QUESTION_PROMPT.format(k=k, pr_text=pr_text_of(it))) for it in items]
+            try:
+                results = []
+                for it, fut in zip(items, futures):
+                    qs = parse_questions(fut.result(), k)
+                    results.append({"id": it.get("id"), "pr_title": extract_title(pr_text_of(it)),
+                                    "questions": qs, "clarify_questions": format_questions(qs)})
+            except Exception as e:
+                return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            self._send(200, {"results": results})
+
+        def log_message(self, fmt, *args):
+            pass  # one line per request is too chatty under load
+
+    return Handler
+
+
+def ask_server(url: str, objs: List[dict], k: int, timeout: float = 600) -> List[List[str]]:
+    """
+    Client side: sends one window of PRs and returns their questions in order.
+    """
+    items = [{"id": str(o.get("id")), "pr_text": pr_text_of(o)} for o in objs]
+    body = json.dumps({"items": items, "k": k}).encode("utf-8")
+    req = urllib.request.Request(url.rstrip("/") + "/questions", data=body,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return [r["questions"] for r in json.load(resp)["results"]]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Long-lived ClarifyCoder server with dynamic batching.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--base_model", default=BASE_MODEL)
+    ap.add_argument("--adapter", default=ADAPTER, help="PEFT adapter ('' to disable)")
+    ap.add_argument("--no_4bit", action="store_true")
+    ap.add_argument("--tiny", action="store_true", help="Serve a tiny random model on CPU (for tests)")
+    ap.add_argument("--max_batch", type=int, default=8, help="Most prompts per generate() call")
+    ap.add_argument("--max_wait_ms", type=float, default=20, help="How long a batch waits to fill up")
+    ap.add_argument("--max_new_tokens", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.tiny:
+        tok, model = load_tiny_model()
+        label = "tiny-random"
+    else:
+        tok, model = load_model(args.base_model, args.adapter or None, load_4bit=not args.no_4bit)
+        label = args.base_model + (f"+{args.adapter}" if args.adapter else "")
+    print(f"[SERVER] loaded {label} in {time.perf_counter() - t0:.1f}s")
+
+    batcher = DynamicBatcher(tok, model, args.max_batch, args.max_wait_ms, args.max_new_tokens)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(batcher, label))
+    print(f"[SERVER] listening on http://{args.host}:{args.port} (POST /questions, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("[SERVER] " + " ".join(f"{k}={v}" for k, v in batcher.stats().items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+`clarify-pr` entry point. Each subcommand names the module whose main(argv)
+runs it; the module is imported only when its subcommand runs, so
+`clarify-pr --help` and the light commands start without loading model,
+numeric or plotting libraries.
+"""
+import importlib
+import sys
+
+PROG = "clarify-pr"
+
+# subcommand -> (module in this package, one-line help), in workflow order
+COMMANDS = {
+    "questions": ("clarifier", "Generate clarifying questions with ClarifyCoder"),
+    "serve": ("clarifier_server", "Long-lived clarifier server with dynamic batching"),
+    "baseline": ("baseline", "Review PRs without clarifications"),
+    "clarified": ("clarified", "Review PRs with the clarifying Q&A"),
+    "review": ("review_runner", "Baseline and clarified reviews in one pass"),
+    "compare": ("compare_reviews", "Join baseline and clarified reviews into comparison.tsv"),
+    "eval-tsv": ("make_eval_tsv", "Build an eval sheet from questions and answers"),
+    "scoring-sheet": ("add_scoring_columns", "Write an empty eval_scored.tsv to fill in by hand"),
+    "score": ("judge", "Score both reviews with an LLM judge into eval_scored.tsv"),
+    "summarize": ("summarize_eval", "Summarize eval_scored.tsv into eval_summary.tsv"),
+    "figures": ("generate_figures", "Render report figures into results/plots"),
+    "gate": ("gating", "Decide per PR whether clarification is worth it"),
+    "dedup": ("dedup", "Group near-duplicate PRs"),
+    "merge": ("sharding", "Merge sharded outputs"),
+    "store": ("result_store", "Index, look up and convert result files"),
+    "metrics": ("summarize_metrics", "Summarize per-call metrics JSONL"),
+}
+
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = [f"usage: {PROG} <command> [options]", "", "commands:"]
+    lines += [f"  {name.ljust(width)}  {help_}" for name, (_, help_) in COMMANDS.items()]
+    lines += ["", f"Run `{PROG} <command> --help` for the options of one command."]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    if argv[0] == "--version":
+        from importlib.metadata import PackageNotFoundError, version
+        try:
+            print(f"{PROG} {version('clarify-pr-review')}")
+        except PackageNotFoundError:
+            print(f"{PROG} (not installed)")
+        return 0
+
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        sys.stderr.write(f"{PROG}: unknown command '{name}'\n\n{usage()}\n")
+        return 2
+    module = importlib.import_module(f"{__package__}.{COMMANDS[name][0]}")
+    sys.argv[0] = f"{PROG} {name}"  # argparse takes its prog from here
+    module.main(rest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import argparse
+import csv
+import json
+import os
+import tempfile
+import zlib
+from itertools import groupby
+from typing import Iterator, Tuple
+
+from .io_utils import id_key, iter_jsonl, project
+from .result_store import ParquetRowWriter, is_parquet, open_store
+
+BASELINE_COLS = ["id", "prompt", "baseline_review"]
+CLARIFIED_COLS = ["id", "clarified_review"]
+OUTPUT_COLS = ["id", "prompt", "baseline_review", "clarified_review"]
+
+
+def load_jsonl(path, columns, quiet: bool = False):
+    """
+    Streams the `columns` of each JSONL record, with id normalised to str.
+    Parquet inputs are read column-wise, so other columns are never loaded.
+    `quiet` skips malformed JSONL lines without a warning.
+    """
+    rows = open_store(path).scan(columns) if is_parquet(path) else project(iter_jsonl(path, quiet=quiet), columns)
+    for row in rows:
+        row["id"] = str(row["id"])
+        yield row
+
+
+def load_latest(path, columns):
+    """
+    Like load_jsonl, but only the last record of each id, where it stands in
+    the file: a review redone by --resume (after a failure, a truncated
+    stream or a corrupt line) supersedes the earlier one. Two streaming
+    passes; the first reads only ids, and only id -> last position is kept.
+    """
+    last = {}
+    for i, row in enumerate(load_jsonl(path, ["id"], quiet=True)):
+        last[row["id"]] = i
+    for i, row in enumerate(load_jsonl(path, columns)):
+        if last[row["id"]] == i:
+            yield row
+
+
+def escape_cell(x):
+    # keep every record on one TSV line
+    if x is None:
+        return ""
+    if isinstance(x, str):
+        return x.replace("\n", "\\n").strip()
+    return x
+
+
+def unescape_cell(x: str) -> str:
+    return x.replace("\\n", "\n")
+
+
+def iter_comparison(path):
+    """
+    Reads a comparison.tsv written by this script back into dicts with real newlines.
+    A .parquet comparison needs no unescaping.
+    """
+    if is_parquet(path):
+        yield from open_store(path).scan()
+        return
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rdr = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE, escapechar="\\")
+        header = next(rdr, [])
+        for row in rdr:
+            if row:
+                yield {k: unescape_cell(v) for k, v in zip(header, row)}
+
+
+def join_index(baseline_path, clarified_path) -> Iterator[Tuple[dict, dict]]:
+    """
+    Holds only the clarified reviews in memory and streams the baseline side.
+    Output follows baseline order, like pd.merge(how="inner"), with the last
+    record of each id on either side.
+    """
+    right = {row["id"]: row for row in load_jsonl(clarified_path, CLARIFIED_COLS)}  # later records win
+    for left in load_latest(baseline_path, BASELINE_COLS):
+        r = right.get(left["id"])
+        if r is not None:
+            yield left, r
+
+
+def _sorted_groups(path, columns):
+    last = None
+    for pid, rows in groupby(load_jsonl(path, columns), key=lambda r: r["id"]):
+        k = id_key(pid)
+        if last is not None and k <= last:
+            # an id redone by --resume is appended further down, which looks the same
+            raise ValueError(f"{path} is not sorted by id with one record per id (saw {pid!r} after a larger or "
+                             f"equal id); rewrite it with `clarify-pr merge {path} --output <sorted.jsonl>` "
+                             f"or use --join hash")
+        last = k
+        yield k, list(rows)[-1]  # of a run of equal ids, the last record wins
+
+
+def join_merge(baseline_path, clarified_path) -> Iterator[Tuple[dict, dict]]:
+    """
+    Sort-merge join for inputs already sorted by id, with each id once (or
+    repeated only on adjacent lines); constant memory. A file that --resume
+    appended to is usually not; `clarify-pr merge` sorts it and keeps the
+    last record of each id.
+    """
+    left_groups = _sorted_groups(baseline_path, BASELINE_COLS)
+    right_groups = _sorted_groups(clarified_path, CLARIFIED_COLS)
+    left = next(left_groups, None)
+    right = next(right_groups, None)
+    while left is not None and right is not None:
+        if left[0] < right[0]:
+            left = next(left_groups, None)
+        elif left[0] > right[0]:
+            right = next(right_groups, None)
+        else:
+            yield left[1], right[1]
+            left = next(left_groups, None)
+            right = next(right_groups, None)
+
+
+def _spill(path, columns, tmpdir, side, partitions):
+    files = [open(os.path.join(tmpdir, f"{side}.{p}.jsonl"), "w", encoding="utf-8") for p in range(partitions)]
+    try:
+        for row in load_jsonl(path, columns):
+            p = zlib.crc32(row["id"].encode("utf-8")) % partitions
+            files[p].write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        for f in files:
+            f.close()
+
+
+def join_hash(baseline_path, clarified_path, partitions: int = 64) -> Iterator[Tuple[dict, dict]]:
+    """
+    Grace hash join: both inputs are partitioned to temp files by crc32(id),
+    then each partition is joined in memory. Peak memory is about one
+    partition of clarified reviews. Output is grouped by partition.
+    """
+    with tempfile.TemporaryDirectory(prefix="compare_") as tmpdir:
+        _spill(baseline_path, BASELINE_COLS, tmpdir, "baseline", partitions)
+        _spill(clarified_path, CLARIFIED_COLS, tmpdir, "clarified", partitions)
+        for p in range(partitions):
+            yield from join_index(
+                os.path.join(tmpdir, f"baseline.{p}.jsonl"),
+                os.path.join(tmpdir, f"clarified.{p}.jsonl"),
+            )
+
+
+def join_lookup(baseline_path, clarified_path) -> Iterator[Tuple[dict, dict]]:
+    """
+    Streams the baseline side and fetches each clarified review by id from
+    its store (sidecar offset index + mmap, or Parquet). Only the id index is
+    held in memory. Output follows baseline order; for duplicate ids on
+    either side the last record is used.
+    """
+    with open_store(clarified_path) as store:
+        for left in load_latest(baseline_path, BASELINE_COLS):
+            right = store.get(left["id"], CLARIFIED_COLS)
+            if right is not None:
+                right["id"] = str(right["id"])
+                yield left, right
+
+
+JOINS = {"index": join_index, "merge": join_merge, "hash": join_hash, "lookup": join_lookup}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare baseline vs clarified reviews")
+    ap.add_argument("--baseline", required=True, help="Path to baseline.jsonl")
+    ap.add_argument("--clarified", required=True, help="Path to clarified.jsonl")
+    ap.add_argument("--output", required=True, help="Path to write comparison.tsv (or .parquet, stored unescaped)")
+    ap.add_argument("--join", choices=sorted(JOINS), default="index",
+                    help="index: clarified reviews in memory, baseline order (default); "
+                         "merge: both inputs pre-sorted by id, constant memory; "
+                         "hash: spill both inputs to disk partitions, for unsorted inputs larger than RAM; "
+                         "lookup: fetch clarified reviews by id through result_store (JSONL index or Parquet)")
+    args = ap.parse_args(argv)
+
+    if is_parquet(args.output):
+        with ParquetRowWriter(args.output) as w:
+            for left, right in JOINS[args.join](args.baseline, args.clarified):
+                row = {**left, **right}
+                w.write({c: row[c] for c in OUTPUT_COLS})
+        print(f"Wrote Parquet with {w.count} rows -> {args.output}")
+        return
+
+    wrote = 0
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        # Save without quoting unless absolutely necessary
+        w = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_NONE, escapechar="\\", lineterminator="\n")
+        w.writerow(OUTPUT_COLS)
+        for left, right in JOINS[args.join](args.baseline, args.clarified):
+            row = {**left, **right}
+            w.writerow([escape_cell(row[c]) for c in OUTPUT_COLS])
+            wrote += 1
+
+    print(f"Wrote clean TSV with {wrote} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import argparse
+import csv
+import hashlib
+import re
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Tuple
+
+from .io_utils import pr_text_of
+from .resilience import payload_record
+
+if TYPE_CHECKING:
+    import numpy as np  # imported where it is used, so --help starts fast
+
+SHINGLE = 5  # characters per shingle
+HASH_BLOCK = 8192  # shingles hashed against all permutations at once
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercases, maps every number to 0 (so version bumps look alike) and
+    collapses punctuation and whitespace.
+    """
+    text = re.sub(r"\d+", "0", text.lower())
+    return re.sub(r"[\W_]+", " ", text).strip()
+
+
+def shingles(text: str) -> "np.ndarray":
+    import numpy as np
+    if len(text) <= SHINGLE:
+        grams = {text}
+    else:
+        grams = {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+    return np.fromiter((int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+                        for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows) whose S-curve midpoint (1/b)^(1/r) is closest to the threshold.
+    """
+    best = None
+    for r in range(1, num_perm + 1):
+        b = num_perm // r
+        err = abs((1 / b) ** (1 / r) - threshold)
+        if best is None or err < best[0]:
+            best = (err, b, r)
+    return best[1], best[2]
+
+
+class DedupIndex:
+    """
+    MinHash + LSH over normalised PR text. Each PR is compared with the
+    group representatives in its LSH buckets; it joins the first one whose
+    estimated Jaccard similarity reaches `threshold`, otherwise it becomes
+    a new representative. Only representatives are indexed, so groups do
+    not drift through chains of near-duplicates.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, seed: int = 1):
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        self.threshold = threshold
+        # permutation i of a 64-bit hash h: (h ^ xor[i]) * mul[i] mod 2**64, mul odd
+        self.xor = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+        self.mul = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self.buckets = defaultdict(list)
+        self.signatures: Dict[tuple, "np.ndarray"] = {}
+        self.seen = 0
+        self.duplicates = 0
+
+    def signature(self, text: str) -> "np.ndarray":
+        import numpy as np
+        hashes = shingles(normalize(text))
+        sig = np.full(len(self.mul), np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(hashes), HASH_BLOCK):
+            block = hashes[start:start + HASH_BLOCK, None]
+            sig = np.minimum(sig, ((block ^ self.xor) * self.mul).min(axis=0))
+        return sig
+
+    def _keys(self, sig: "np.ndarray", kind):
+        for band in range(self.bands):
+            yield kind, band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def find_or_add(self, pid: str, text: str, kind=None) -> Tuple[str, float]:
+        """
+        Returns (representative id, estimated similarity); a PR that starts
+        a new group is its own representative with similarity 1.0. PRs are
+        only grouped with others of the same `kind`.
+        """
+        self.seen += 1
+        sig = self.signature(text)
+        checked = set()
+        for key in self._keys(sig, kind):
+            for rep in self.buckets.get(key, ()):
+                if rep in checked:
+                    continue
+                checked.add(rep)
+                sim = float((self.signatures[kind, rep] == sig).mean())
+                if sim >= self.threshold:
+                    self.duplicates += 1
+                    return rep, sim
+        self.signatures[kind, pid] = sig
+        for key in self._keys(sig, kind):
+            self.buckets[key].append(pid)
+        return pid, 1.0
+
+    def report(self) -> str:
+        rate = self.duplicates / self.seen if self.seen else 0.0
+        return (f"prs={self.seen} groups={self.seen - self.duplicates} reused={self.duplicates} "
+                f"reuse_rate={rate:.1%}")
+
+
+def dedup_map(requests: Iterable, index: DedupIndex, engine, run_one) -> Iterator:
+    """
+    Wraps a review engine (an iterator of (payload, review) over requests)
+    so near-duplicate PRs are not sent: each reuses its representative's
+    review, at its own position in the output. Tuple payloads are grouped
+    per leading tag, so a baseline review is never reused as a clarified
+    one, and records carrying Q&A are only grouped with records whose
+    questions and answers are identical, since the review depends on them.
+    Payloads the engine drops (failed requests) are dropped here too;
+    `run_one(prompt, payload)` reviews a duplicate whose representative
+    failed, returning None if that fails as well.
+    """
+    pending = deque()
+    reviews: Dict[tuple, Tuple[str, bool]] = {}
+
+    def kind_of(payload):
+        return payload[:-1] if isinstance(payload, tuple) else None
+
+    def group_of(payload, rec):
+        return kind_of(payload), tuple(rec.get("questions") or ()), tuple(rec.get("answers") or ())
+
+    def unique():
+        for prompt, payload in requests:
+            rec = payload_record(payload)
+            pid = str(rec.get("id"))
+            rep, _ = index.find_or_add(pid, pr_text_of(rec), group_of(payload, rec))
+            pending.append((prompt, payload, None if rep == pid else (kind_of(payload), rep)))
+            if rep == pid:
+                yield prompt, payload
+
+    def flush_dups(until=None):
+        while pending and pending[0][1] is not until:
+            prompt, payload, rep = pending.popleft()
+            if rep is None:
+                continue  # a unique request the engine dropped
+            if rep in reviews:
+                review, truncated = reviews[rep]
+                if truncated:
+                    payload_record(payload)["truncated"] = True
+            else:
+                review = run_one(prompt, payload)
+                if review is None:
+                    continue
+            yield payload, review
+
+    for payload, review in engine(unique()):
+        yield from flush_dups(until=payload)
+        pending.popleft()
+        rec = payload_record(payload)
+        reviews[kind_of(payload), str(rec.get("id"))] = review, bool(rec.get("truncated"))
+        yield payload, review
+    yield from flush_dups()
+
+
+def main(argv=None):
+    from .clarified import load_prs_jsonl
+
+    ap = argparse.ArgumentParser(description="Group near-duplicate PRs with MinHash/LSH.")
+    ap.add_argument("--input", required=True, help="PR JSONL with {id, pr_text|prompt}")
+    ap.add_argument("--output", default=None, help="TSV of id, group (representative id), similarity")
+    ap.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity to count as a duplicate")
+    ap.add_argument("--num_perm", type=int, default=128)
+    ap.add_argument("--limit", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    index = DedupIndex(args.threshold, args.num_perm)
+    out: Optional[csv.writer] = None
+    f = open(args.output, "w", newline="", encoding="utf-8") if args.output else None
+    try:
+        if f:
+            out = csv.writer(f, delimiter="\t", lineterminator="\n")
+            out.writerow(["id", "group", "similarity"])
+        for obj in load_prs_jsonl(args.input, args.limit):
+            pid = str(obj.get("id"))
+            rep, sim = index.find_or_add(pid, pr_text_of(obj))
+            if out:
+                out.writerow([pid, rep, f"{sim:.3f}"])
+    finally:
+        if f:
+            f.close()
+    # each reused PR saves one clarifier pass and two review calls
+    print(f"[DEDUP] {index.report()} calls_saved={3 * index.duplicates}")
+
+
+if __name__ == "__main__":
+    main()
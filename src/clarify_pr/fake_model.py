@@ -0,0 +1,160 @@
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+# per-call wall-clock latencies (seconds) of every FakeModel in this process
+CALL_LOG = []
+
+# task headers of a packed prompt (packing.TASK_BLOCK)
+TASK_HEADER = re.compile(r"(?m)^### Task (\d+)\n")
+
+LOREM = (
+    "Consider adding tests for the edge cases. The description does not say how errors are surfaced. "
+    "Document the expected behaviour and guard the new code path behind a flag. "
+)
+
+
+class FakeAPIError(Exception):
+    """
+    Simulated API failure; `code` mirrors the HTTP status a real call would carry.
+    """
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeResponse:
+    def __init__(self, text: str, prompt_tokens: int):
+        self.text = text
+        out_tokens = max(1, len(text) // 4)
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=out_tokens,
+            total_token_count=prompt_tokens + out_tokens,
+        )
+
+
+class FakeModel:
+    """
+    Offline stand-in for genai.GenerativeModel used for benchmarking.
+
+    latency: fixed | uniform | exponential | lognormal, with mean latency_ms
+             (lognormal spread is controlled by sigma)
+    error_rate: probability a call raises FakeAPIError (429/500/503)
+    straggler_rate: probability a call hangs for straggler_ms instead
+    response_chars: length of the generated review text (per task of a
+                    packed prompt, which gets the JSON array packing.py asks for)
+    """
+
+    def __init__(self, latency: str = "lognormal", latency_ms: float = 200.0, sigma: float = 0.5,
+                 error_rate: float = 0.0, response_chars: int = 800, seed: int | None = None,
+                 straggler_rate: float = 0.0, straggler_ms: float = 30000.0):
+        if latency not in ("fixed", "uniform", "exponential", "lognormal"):
+            raise ValueError(f"unknown latency distribution: {latency}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.response_chars = response_chars
+        self.straggler_rate = straggler_rate
+        self.straggler_ms = straggler_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FakeModel":
+        """
+        Parses "fake" or "fake:latency_ms=50,error_rate=0.01,latency=fixed".
+        """
+        _, _, opts = spec.partition(":")
+        kwargs = {}
+        for part in filter(None, opts.split(",")):
+            k, _, v = part.partition("=")
+            k = k.strip()
+            if k == "latency":
+                kwargs[k] = v.strip()
+            elif k in ("response_chars", "seed"):
+                kwargs[k] = int(v)
+            else:
+                kwargs[k] = float(v)
+        return cls(**kwargs)
+
+    def _sample_latency(self) -> float:
+        mean = self.latency_ms / 1000.0
+        with self._lock:
+            if self.straggler_rate and self._rng.random() < self.straggler_rate:
+                return self.straggler_ms / 1000.0
+            if self.latency == "fixed":
+                return mean
+            if self.latency == "uniform":
+                return self._rng.uniform(0, 2 * mean)
+            if self.latency == "exponential":
+                return self._rng.expovariate(1 / mean) if mean > 0 else 0.0
+            mu = math.log(mean) - self.sigma ** 2 / 2 if mean > 0 else 0.0
+            return self._rng.lognormvariate(mu, self.sigma) if mean > 0 else 0.0
+
+    def _fail(self):
+        with self._lock:
+            if self._rng.random() >= self.error_rate:
+                return None
+            return self._rng.choice([(429, "Resource has been exhausted"), (500, "Internal error"), (503, "Service unavailable")])
+
+    def _text(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        body = (LOREM * (self.response_chars // len(LOREM) + 1))[:max(0, self.response_chars - 20)]
+        return f"[fake {digest}] {body}"
+
+    def _packed_text(self, prompt: str) -> str | None:
+        """
+        The JSON array a packed prompt asks for, or None if `prompt` has no task headers.
+        """
+        parts = TASK_HEADER.split(prompt)[1:]  # task number, task body, ...
+        if not parts:
+            return None
+        return json.dumps([{"task": int(num), "review": self._text(body)} for num, body in zip(parts[::2], parts[1::2])])
+
+    def generate_content(self, prompt, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            time.sleep(self._sample_latency())
+            err = self._fail()
+            if err:
+                raise FakeAPIError(*err)
+            config = kwargs.get("generation_config") or {}
+            text = None
+            if config.get("response_mime_type") == "application/json":
+                text = self._packed_text(prompt)
+            return FakeResponse(text or self._text(prompt), prompt_tokens=max(1, len(prompt) // 4))
+        finally:
+            CALL_LOG.append(time.perf_counter() - t0)
+
+    def stream_content(self, prompt, pieces: int = 8, **kwargs):
+        """
+        Streamed variant: the first piece arrives after 30% of the sampled
+        latency, the rest evenly over the remainder. Only the last piece
+        carries usage_metadata, as with Gemini.
+        """
+        t0 = time.perf_counter()
+        try:
+            total = self._sample_latency()
+            time.sleep(total * 0.3)
+            err = self._fail()
+            if err:
+                raise FakeAPIError(*err)
+            text = self._text(prompt)
+            step = max(1, -(-len(text) // pieces))
+            for i in range(0, len(text), step):
+                if i:
+                    time.sleep(total * 0.7 / pieces)
+                if i + step >= len(text):
+                    yield FakeResponse(text[i:], prompt_tokens=max(1, len(prompt) // 4))
+                else:
+                    yield SimpleNamespace(text=text[i:i + step], usage_metadata=None)
+        finally:
+            CALL_LOG.append(time.perf_counter() - t0)
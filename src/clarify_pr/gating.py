@@ -0,0 +1,225 @@
+import argparse
+import csv
+import json
+import math
+import re
+import sys
+from itertools import islice
+from pathlib import Path
+
+from .clarifier import extract_title
+from .io_utils import iter_jsonl, pr_text_of
+from .resilience import DeadLetter, is_request_error
+from .run_utils import add_model_args, open_model, ordered_map, print_stats
+
+GATE_COLS = ["id", "pr_title", "ambiguity", "source", "decision"]
+
+# requirement words that leave the "how much / how exactly" open
+VAGUE = re.compile(r"\b(better|improve[ds]?|optimi[sz]e[ds]?|faster|clearer|cleaner|simpler|nicer|more|less|"
+                   r"helpful|correct(?:ly)?|efficient(?:ly)?|accurate(?:ly)?|robust|appropriate|reasonable|"
+                   r"properly|etc|some|similar|various)\b", re.I)
+HEDGE = re.compile(r"\b(or something|not (?:yet )?(?:specified|decided|defined)|tbd|todo|unclear|maybe|somehow)\b", re.I)
+# concrete anchors: paths, numbers, code identifiers, inline code
+CONCRETE = re.compile(r"(/[\w.-]+(?:/[\w.{}-]+)+|\b\d+(?:\.\d+)?\s*(?:ms|s|min|kb|mb|%|items|rows)?\b|"
+                      r"\b[a-z]+_[a-z_]+\b|\b[a-z]+[A-Z]\w*\b|`[^`]+`)")
+QUOTED = re.compile(r"\"[^\"]{3,}\"")
+
+# logistic weights over ambiguity_features(); > 0 pushes toward clarifying
+WEIGHTS = {"vague": 0.9, "hedge": 1.5, "quoted": 1.0, "short": 1.0, "concrete": -0.6, "has_diff": -2.0}
+BIAS = -0.5
+
+GATE_PROMPT = """You are triaging pull requests before code review.
+Rate how much a reviewer would need to ask the author before giving a useful review:
+missing requirements, vague goals, or statements that contradict each other.
+
+Pull request:
+{pr_text}
+
+Return only a JSON object: {{"ambiguity": <number from 0 (clear) to 1 (needs clarification)>}}
+"""
+GATE_CONFIG = {"response_mime_type": "application/json", "temperature": 0}
+
+
+def ambiguity_features(pr_text: str) -> dict:
+    """
+    Cheap text features of the PR description (the part before any diff).
+    Counts are capped so one long list of vague words cannot dominate.
+    """
+    desc = pr_text.split("\ndiff --git ", 1)[0]
+    desc = re.sub(r"(?im)^\s*(pr title|description)\s*:", " ", desc)
+    words = len(desc.split())
+    return {
+        "vague": min(3, len(VAGUE.findall(desc))),
+        "hedge": min(2, len(HEDGE.findall(desc))),
+        "quoted": min(2, len(QUOTED.findall(desc))),
+        "short": float(words < 12),
+        "concrete": min(5, len(CONCRETE.findall(desc))),
+        "has_diff": float("diff --git " in pr_text),
+    }
+
+
+def heuristic_score(features: dict) -> float:
+    z = BIAS + sum(WEIGHTS[k] * v for k, v in features.items())
+    return 1 / (1 + math.exp(-z))
+
+
+def parse_ambiguity(text: str) -> float:
+    text = (text or "").strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.S)
+    if fenced:
+        text = fenced.group(1)
+    value = float(json.loads(text)["ambiguity"])
+    return min(1.0, max(0.0, value))
+
+
+def gate_row(obj: dict, threshold: float, band, model=None) -> dict:
+    """
+    Scores one PR. With a model, heuristic scores inside `band` (too close to
+    call) are replaced by a single scoring call.
+    """
+    pr_text = pr_text_of(obj)
+    score, source = heuristic_score(ambiguity_features(pr_text)), "heuristic"
+    if model is not None and band[0] <= score <= band[1]:
+        resp = model.generate_content(GATE_PROMPT.format(pr_text=pr_text.strip()), generation_config=GATE_CONFIG)
+        score, source = parse_ambiguity(resp.text), "model"
+    return {"id": str(obj.get("id")), "pr_title": extract_title(pr_text), "ambiguity": f"{score:.3f}",
+            "source": source, "decision": "clarify" if score >= threshold else "baseline"}
+
+
+def load_gate(path: str) -> dict:
+    """
+    id -> "clarify" | "baseline" from a gate TSV.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        return {row["id"]: row["decision"] for row in csv.DictReader(f, delimiter="\t")}
+
+
+def baseline_only_ids(path: str | None) -> set:
+    """
+    Ids a gate TSV routed to baseline only; empty without a gate.
+    """
+    if not path:
+        return set()
+    return {pid for pid, decision in load_gate(path).items() if decision == "baseline"}
+
+
+def run_score(args):
+    model = open_model(args, args.gate_model, "gating") if args.gate_model else None
+    dead = DeadLetter(args.dead_letter)
+
+    def score_one(obj):
+        try:
+            return gate_row(obj, args.threshold, args.band, model)
+        except Exception as e:
+            if not is_request_error(e):
+                raise
+            dead.record(obj, e)
+            # a failed scoring call keeps the full clarify path
+            return gate_row(obj, args.threshold, args.band) | {"decision": "clarify", "source": "fallback"}
+
+    counts = {"clarify": 0, "baseline": 0, "model": 0}
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=GATE_COLS, delimiter="\t", lineterminator="\n")
+        w.writeheader()
+        for row in ordered_map(score_one, islice(iter_jsonl(args.input), args.limit), args.concurrency):
+            w.writerow(row)
+            counts[row["decision"]] += 1
+            counts["model"] += row["source"] == "model"
+
+    dead.report()
+    print(f"[GATE] clarify={counts['clarify']} baseline_only={counts['baseline']} "
+          f"scoring_calls={counts['model']} -> {args.output}")
+    if model is not None:
+        print_stats("GATE", model)
+
+
+def gate_report(gate_path: str, scored_path: Path, n_boot: int = 1000, seed: int = 0) -> dict:
+    """
+    Weighs a gate against judged results of the full pipeline: the calls it
+    saves, and the quality delta it keeps if baseline-only PRs get their
+    baseline review in place of the clarified one.
+    """
+    import numpy as np
+    from .result_store import is_parquet
+    from .summarize_eval import (BASELINE_SUFFIX, CLARIFIED_SUFFIX, metric_pairs, read_columns, read_parquet_columns,
+                                summarize_group, to_num_array)
+
+    with open(gate_path, encoding="utf-8", newline="") as f:
+        gate_rows = list(csv.DictReader(f, delimiter="\t"))
+    decision = {r["id"]: r["decision"] for r in gate_rows}
+    skipped = sum(d == "baseline" for d in decision.values())
+    scoring = sum(r["source"] == "model" for r in gate_rows)
+
+    header, cols, n_rows = (read_parquet_columns(scored_path, ["id"]) if is_parquet(scored_path)
+                            else read_columns(scored_path))
+    metrics = metric_pairs(header)
+    numeric = {name: to_num_array(cols[name]) for m in metrics for name in (m + BASELINE_SUFFIX, m + CLARIFIED_SUFFIX)}
+    keep = np.array([decision.get(pid, "clarify") == "clarify" for pid in cols["id"]], dtype=bool)
+    gated = dict(numeric)
+    for m in metrics:
+        gated[m + CLARIFIED_SUFFIX] = np.where(keep, numeric[m + CLARIFIED_SUFFIX], numeric[m + BASELINE_SUFFIX])
+
+    rng = np.random.default_rng(seed)
+    groups = {
+        "all": summarize_group(numeric, metrics, n_boot, 0.95, rng),
+        "gated": summarize_group(gated, metrics, n_boot, 0.95, rng),
+        "clarify": summarize_group({k: v[keep] for k, v in numeric.items()}, metrics, 0, 0.95, rng),
+        "skipped": summarize_group({k: v[~keep] for k, v in numeric.items()}, metrics, 0, 0.95, rng),
+    }
+    return {
+        "prs": len(decision),
+        "baseline_only": skipped,
+        # per skipped PR: one clarifier generation and one clarified review
+        "calls_saved": 2 * skipped - scoring,
+        "answers_saved": skipped,
+        "scored_rows": n_rows,
+        "metrics": {m: {g: s[f"delta_{m}"] for g, s in groups.items()} | {
+            "gated_ci": (groups["gated"][f"delta_{m}_ci_low"], groups["gated"][f"delta_{m}_ci_high"])}
+            for m in metrics},
+    }
+
+
+def run_report(args):
+    from .summarize_eval import fmt
+
+    rep = gate_report(args.gate, Path(args.scored), args.bootstrap, args.seed)
+    print(f"[GATE] prs={rep['prs']} baseline_only={rep['baseline_only']} calls_saved={rep['calls_saved']} "
+          f"answers_saved={rep['answers_saved']} (judged rows: {rep['scored_rows']})")
+    print("metric\tdelta_all\tdelta_gated\tretained\tdelta_clarify\tdelta_skipped")
+    for m, d in rep["metrics"].items():
+        retained = d["gated"] / d["all"] if d["all"] else math.nan
+        print(f"{m}\t{fmt(d['all'])}\t{fmt(d['gated'])} [{fmt(d['gated_ci'][0])}, {fmt(d['gated_ci'][1])}]"
+              f"\t{fmt(100 * retained, 0)}%\t{fmt(d['clarify'])}\t{fmt(d['skipped'])}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Decide per PR whether clarifying questions are worth asking.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("score", help="Write a gate TSV (id, pr_title, ambiguity, source, decision)")
+    p.add_argument("--input", required=True, help="PR JSONL with {id, pr_text|prompt}")
+    p.add_argument("--output", required=True, help="Gate TSV, read by clarifier/clarified/review_runner --gate")
+    p.add_argument("--limit", type=int, default=None)
+    p.add_argument("--threshold", type=float, default=0.5, help="Ambiguity at or above which a PR is clarified")
+    p.add_argument("--gate_model", default=None,
+                   help="Model for one scoring call on PRs the heuristic cannot call (default: heuristic only)")
+    p.add_argument("--band", type=float, nargs=2, default=(0.35, 0.65), metavar=("LOW", "HIGH"),
+                   help="Heuristic scores in this range go to --gate_model")
+    add_model_args(p)
+
+    p = sub.add_parser("report", help="Calls saved vs. quality delta kept, from a judged full run")
+    p.add_argument("--gate", required=True, help="Gate TSV from `score`")
+    p.add_argument("--scored", default=str(Path(__file__).resolve().parents[2] / "results" / "eval_scored.tsv"),
+                   help="eval_scored.tsv (or .parquet) with both reviews judged for every PR")
+    p.add_argument("--bootstrap", type=int, default=1000)
+    p.add_argument("--seed", type=int, default=0)
+
+    args = ap.parse_args(argv)
+    if args.cmd == "score":
+        run_score(args)
+    else:
+        run_report(args)
+
+
+if __name__ == "__main__":
+    main()
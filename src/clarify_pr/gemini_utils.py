@@ -0,0 +1,13 @@
+from .backends import get_backend
+
+
+def configure_gemini(model_name: str = "gemini-1.5-flash", **opts):
+    """
+    Returns the shared Gemini backend for the given model (see backends.py).
+    Requires GEMINI_API_KEY env var; the client is configured once per process.
+    Model names starting with "fake" (e.g. "fake:latency_ms=50") return the
+    offline stub backend instead, for benchmarks without an API key.
+    """
+    if model_name.startswith("fake"):
+        return get_backend("stub", model_name)
+    return get_backend("gemini", model_name, **opts)
@@ -0,0 +1,238 @@
+import argparse
+import csv
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[2]
+DEFAULT_SUMMARY = BASE / "results" / "eval_summary.tsv"
+DEFAULT_SCORED = BASE / "results" / "eval_scored.tsv"
+DEFAULT_OUT_DIR = BASE / "results" / "plots"
+STAMP_FILE = ".figure_hashes.json"
+
+# display names for the metrics in the report; others are title-cased
+LABELS = {
+    "specificity": "Specificity",
+    "actionability": "Actionability",
+    "assumption_identification": "Assumptions Identified",
+    "comment_quality": "Comment Quality",
+    "suggestions": "Suggestions",
+}
+
+
+def label(metric: str) -> str:
+    return LABELS.get(metric, metric.replace("_", " ").title())
+
+
+def to_float(s: str) -> float:
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+# Data loading
+
+def load_metrics_table(path: Path) -> dict:
+    """
+    Reads the first row of eval_summary.tsv into {"metric", "baseline", "clarified", "delta"} lists.
+    """
+    with path.open(encoding="utf-8") as f:
+        row = next(csv.DictReader(f, delimiter="\t"))
+    metrics = [k[: -len("_baseline_mean")] for k in row if k.endswith("_baseline_mean")]
+    return {
+        "metric": [label(m) for m in metrics],
+        "baseline": [to_float(row[f"{m}_baseline_mean"]) for m in metrics],
+        "clarified": [to_float(row[f"{m}_clarified_mean"]) for m in metrics],
+        "delta": [to_float(row.get(f"delta_{m}")) for m in metrics],
+    }
+
+
+def load_deltas(path: Path) -> dict:
+    """
+    Reads eval_scored.tsv into {metric label: [per-PR clarified - baseline]}.
+    """
+    with path.open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    cols = rows[0].keys() if rows else []
+    metrics = [c[: -len("_baseline")] for c in cols if c.endswith("_baseline") and c[: -len("_baseline")] + "_clarified" in cols]
+    deltas = {}
+    for m in dict.fromkeys(metrics):
+        vals = [to_float(r[f"{m}_clarified"]) - to_float(r[f"{m}_baseline"]) for r in rows]
+        deltas[label(m)] = [v for v in vals if v == v]
+    return deltas
+
+
+# Figures; each runs in a worker process and saves to `out`
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def fig_metrics_bars(table: dict, out: str):
+    import numpy as np
+    plt = _pyplot()
+    x = np.arange(len(table["metric"]))
+    width = 0.35
+    plt.figure(figsize=(6, 4))
+    plt.bar(x - width/2,  table["baseline"],  width,  label="Baseline")
+    plt.bar(x + width/2,  table["clarified"],  width,  label="Clarified")
+    plt.xticks(x,  table["metric"],  rotation=30,  ha="right")
+    plt.ylabel("Average Score")
+    plt.title("Average Metric Scores: Baseline vs Clarified")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(out,  dpi=300)
+    plt.close("all")
+
+
+def fig_delta_bars(table: dict, out: str):
+    import numpy as np
+    plt = _pyplot()
+    x = np.arange(len(table["metric"]))
+    plt.figure(figsize=(6, 4))
+    plt.bar(x,  table["delta"])
+    plt.xticks(x,  table["metric"],  rotation=30,  ha="right")
+    plt.ylabel("Delta (Clarified - Baseline)")
+    plt.title("Improvement by Metric")
+    plt.tight_layout()
+    plt.savefig(out,  dpi=300)
+    plt.close("all")
+
+
+def fig_delta_boxplot(deltas: dict, out: str):
+    plt = _pyplot()
+    plt.figure(figsize=(6, 4))
+    plt.boxplot(list(deltas.values()),  tick_labels=list(deltas.keys()))
+    plt.ylabel("Per-PR Delta (Clarified - Baseline)")
+    plt.title("Distribution of Improvements by Metric")
+    plt.xticks(rotation=30,  ha="right")
+    plt.tight_layout()
+    plt.savefig(out,  dpi=300)
+    plt.close("all")
+
+
+W,  H = 1.8,  0.8  # box width/height
+
+
+def draw_box(ax,  xy,  text,  color="#cce5ff"):
+    from matplotlib.patches import FancyBboxPatch
+    x,  y = xy
+    box = FancyBboxPatch((x,  y),  W,  H,  boxstyle="round, pad=0.3",  fc=color,  ec="black")
+    ax.add_patch(box)
+    ax.text(x + W/2,  y + H/2,  text,  ha="center",  va="center",  fontsize=12)
+    # handy anchors on the edges
+    return {
+        "left":   (x,          y + H/2),
+        "right":  (x + W,      y + H/2),
+        "top":    (x + W/2,    y + H),
+        "bottom": (x + W/2,    y)
+    }
+
+
+def arrow(ax,  p1,  p2,  rad=0.0):
+    ax.annotate(
+        "",  xy=p2,  xytext=p1,
+        arrowprops=dict(arrowstyle="-|>",  lw=2,  connectionstyle=f"arc3, rad={rad}")
+    )
+
+
+def fig_architecture(_data, out: str):
+    plt = _pyplot()
+    fig,  ax = plt.subplots(figsize=(11, 5))
+
+    pr = draw_box(ax,  (0.0,  1.0),  "PR Examples\n(JSONL)",       color="#f2f2f2")
+    clar = draw_box(ax,  (3.0,  2.0),  "ClarifyCoder\n(asks)",        color="#ffe6cc")
+    you = draw_box(ax,  (6.0,  2.0),  "You (answers)",               color="#e6ffe6")
+    clarrev = draw_box(ax,  (9.0,  1.0),  "Clarified Reviewer\n(Gemini)",  color="#d9e6f2")
+    base = draw_box(ax,  (3.0,  0.0),  "Baseline Reviewer\n(Gemini)",  color="#d9e6f2")
+
+    # arrows: from box edge to box edge (with slight curvature to avoid text)
+    arrow(ax,  pr["right"],    clar["left"],    rad=0.15)
+    arrow(ax,  clar["right"],  you["left"],     rad=0.00)
+    arrow(ax,  you["right"],   clarrev["left"], rad=-0.15)
+    arrow(ax,  pr["right"],    base["left"],    rad=-0.12)
+
+    ax.set_xlim(-0.5,  11.5)
+    ax.set_ylim(-0.5,  3.5)
+    ax.axis("off")
+    ax.set_title("ClarifyCoder + Gemini Review Pipeline",  fontsize=18,  pad=15)
+    plt.tight_layout()
+    plt.savefig(out,  dpi=300,  bbox_inches="tight")
+    plt.close("all")
+
+
+# name -> (render function, input kind, output file)
+FIGURES = {
+    "metrics_bars": (fig_metrics_bars, "summary", "fig_metrics_bars.png"),
+    "delta_bars": (fig_delta_bars, "summary", "fig_delta_bars.png"),
+    "delta_boxplot": (fig_delta_boxplot, "scored", "fig_delta_boxplot.png"),
+    "architecture": (fig_architecture, None, "fig_architecture.png"),
+}
+DEFAULT_FIGURES = ["metrics_bars", "delta_bars", "architecture"]
+
+
+def input_hash(name: str, data) -> str:
+    """
+    Hash of everything a figure depends on: its name, its input data and this file's code.
+    """
+    h = hashlib.sha256()
+    h.update(name.encode())
+    h.update(json.dumps(data, sort_keys=True).encode())
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render report figures from eval_summary.tsv / eval_scored.tsv.")
+    ap.add_argument("--summary", default=DEFAULT_SUMMARY, help="Path to eval_summary.tsv")
+    ap.add_argument("--scored", default=DEFAULT_SCORED, help="Path to eval_scored.tsv")
+    ap.add_argument("--out_dir", default=DEFAULT_OUT_DIR, help="Directory for the PNGs")
+    ap.add_argument("--figures", default=",".join(DEFAULT_FIGURES),
+                    help=f"Comma-separated subset of: {', '.join(FIGURES)}")
+    ap.add_argument("--workers", type=int, default=None, help="Render processes (default: one per CPU)")
+    ap.add_argument("--force", action="store_true", help="Re-render even if inputs are unchanged")
+    args = ap.parse_args(argv)
+
+    names = [n for n in args.figures.split(",") if n]
+    unknown = [n for n in names if n not in FIGURES]
+    if unknown:
+        raise SystemExit(f"[error] unknown figure(s): {', '.join(unknown)}")
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp_path = out_dir / STAMP_FILE
+    stamps = json.loads(stamp_path.read_text()) if stamp_path.exists() else {}
+
+    loaders = {"summary": lambda: load_metrics_table(Path(args.summary)),
+               "scored": lambda: load_deltas(Path(args.scored)),
+               None: lambda: None}
+    inputs = {}
+    jobs = {}
+    for name in names:
+        fn, kind, filename = FIGURES[name]
+        if kind not in inputs:
+            inputs[kind] = loaders[kind]()
+        out = out_dir / filename
+        digest = input_hash(name, inputs[kind])
+        if not args.force and out.exists() and stamps.get(name) == digest:
+            print(f"[skip] {name}: inputs unchanged")
+            continue
+        jobs[name] = (fn, inputs[kind], str(out), digest)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {name: pool.submit(fn, data, out) for name, (fn, data, out, _) in jobs.items()}
+            for name, fut in futures.items():
+                fut.result()
+                stamps[name] = jobs[name][3]
+                print(f"[render] {name} -> {jobs[name][2]}")
+        stamp_path.write_text(json.dumps(stamps, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
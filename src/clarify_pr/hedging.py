@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+from collections import deque
+
+from .metrics import percentile
+from .resilience import estimate_tokens
+
+HEDGE_REFRESH = 10  # recompute the hedge delay after this many new latency samples
+
+
+class HedgedModel:
+    """
+    Wraps a backend with a per-call deadline and optional hedging. Calls run
+    on daemon threads so a hung one can be abandoned: past `deadline_s` the
+    caller gets a TimeoutError (retried by ResilientModel as transient) and
+    the thread finishes in the background. With `hedge`, a call still running
+    after the observed `hedge_percentile` latency gets one duplicate and the
+    first success wins. Hedges are capped at `budget` times the call count.
+    Streams pass through unhedged.
+
+    Every copy goes through `admission` (a resilience.Admission) and keeps
+    its slot until it really ends, abandoned or not; a hedge is only sent if
+    it is admitted at once. While `max_abandoned` abandoned calls are still
+    running, a new call waits (up to the deadline) for one of them to end
+    before it fails with a TimeoutError.
+    """
+
+    def __init__(self, inner, admission, deadline_s: float = 0, hedge: bool = False, budget: float = 0.05,
+                 max_abandoned: int = 1, hedge_percentile: float = 95, min_samples: int = 20, window: int = 500):
+        self.inner = inner
+        self.admission = admission
+        self.deadline_s = deadline_s
+        self.hedge = hedge
+        self.budget = budget
+        self.max_abandoned = max(1, max_abandoned)
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_denied = 0
+        self.timeouts = 0
+        self.abandoned = 0
+        self._delay = None
+        self._fresh = 0
+        self._lock = threading.Condition()
+
+    def _observe(self, latency: float):
+        with self._lock:
+            self.latencies.append(latency)
+            self._fresh += 1
+
+    def _hedge_delay(self):
+        """
+        Seconds after which a call is hedged; None until enough samples.
+        """
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            if self._delay is None or self._fresh >= HEDGE_REFRESH:
+                self._delay = percentile(list(self.latencies), self.hedge_percentile)
+                self._fresh = 0
+            return self._delay
+
+    def _take_hedge(self, estimate: int) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.calls or not self.admission.acquire(estimate, block=False):
+                self.hedges_denied += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def _call(self, prompt, **kwargs):
+        t0 = time.perf_counter()
+        resp = self.inner.generate_content(prompt, **kwargs)
+        self._observe(time.perf_counter() - t0)
+        return resp
+
+    def _launch(self, prompt, kwargs, estimate: int, results: queue.Queue, waiting: threading.Event, slot: int):
+        """
+        Runs one admitted copy on a daemon thread; it frees its admission slot
+        when it ends, and reports to `results` unless the caller stopped
+        `waiting` (then it was abandoned).
+        """
+        def run():
+            resp, err = None, None
+            try:
+                resp = self._call(prompt, **kwargs)
+            except Exception as e:
+                err = e
+            self.admission.release(estimate, resp, err)
+            with self._lock:
+                if waiting.is_set():
+                    results.put((slot, resp, err))
+                else:
+                    self.abandoned -= 1
+                    self._lock.notify_all()
+        threading.Thread(target=run, daemon=True, name=f"hedged-call-{slot}").start()
+
+    def _timeout(self, message: str):
+        with self._lock:
+            self.timeouts += 1
+        return TimeoutError(message)
+
+    def generate_content(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+        delay = self._hedge_delay() if self.hedge else None
+        if not self.deadline_s and delay is None:
+            return self.admission.call(self._call, prompt, kwargs)
+        with self._lock:
+            if not self._lock.wait_for(lambda: self.abandoned < self.max_abandoned, self.deadline_s or None):
+                self.timeouts += 1
+                raise TimeoutError(f"{self.abandoned} abandoned calls are still running")
+        estimate = estimate_tokens(prompt)
+        if not self.admission.acquire(estimate, timeout=self.deadline_s or None):
+            raise self._timeout(f"no free concurrency slot within the {self.deadline_s:g}s deadline")
+
+        results = queue.Queue()
+        waiting = threading.Event()
+        waiting.set()
+        t0 = time.monotonic()
+        self._launch(prompt, kwargs, estimate, results, waiting, 0)
+        inflight, hedged = 1, delay is None
+        try:
+            while True:
+                waits = [t0 + self.deadline_s] if self.deadline_s else []
+                if not hedged:
+                    waits.append(t0 + delay)
+                timeout = max(0.0, min(waits) - time.monotonic()) if waits else None
+                try:
+                    slot, resp, err = results.get(timeout=timeout)
+                except queue.Empty:
+                    if self.deadline_s and time.monotonic() >= t0 + self.deadline_s:
+                        raise self._timeout(f"no response within the {self.deadline_s:g}s deadline")
+                    hedged = True
+                    if self._take_hedge(estimate):
+                        self._launch(prompt, kwargs, estimate, results, waiting, 1)
+                        inflight += 1
+                    continue
+                inflight -= 1
+                if err is None:
+                    if slot == 1:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return resp
+                if inflight == 0:
+                    raise err
+        finally:
+            # copies still running (a lost hedge, or all of them past the deadline) are abandoned
+            with self._lock:
+                waiting.clear()
+                self.abandoned += inflight - results.qsize()
+
+    def generate_stream(self, prompt, **kwargs):
+        yield from self.admission.stream(self.inner.generate_stream, prompt, kwargs)
+
+    def stats(self) -> dict:
+        delay = self._hedge_delay() if self.hedge else None
+        return {"hedges": self.hedges, "hedge_wins": self.hedge_wins, "hedges_denied": self.hedges_denied,
+                "timeouts": self.timeouts, "abandoned": self.abandoned, "hedge_after_ms": "-" if delay is None else round(delay * 1000)}
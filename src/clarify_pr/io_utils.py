@@ -0,0 +1,74 @@
+import csv
+import json
+import sys
+from itertools import islice
+from typing import Iterable, Iterator
+
+
+def iter_jsonl(path: str, limit: int | None = None, quiet: bool = False) -> Iterator[dict]:
+    """
+    Lazily yields one dict per JSONL line, skipping blank lines and warning
+    on malformed ones (unless `quiet`). Stops after `limit` records without
+    reading further.
+    """
+    return islice(_iter_jsonl(path, quiet), limit)
+
+
+def _iter_jsonl(path: str, quiet: bool = False) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception as e:
+                if not quiet:
+                    sys.stderr.write(f"[WARN] Bad JSON line {i+1} in {path}: {e}\n")
+
+
+def pr_text_of(obj: dict) -> str:
+    """
+    PR text from an input record; both `pr_text` and the older `prompt` key are accepted.
+    """
+    return obj.get("pr_text") or obj.get("prompt") or ""
+
+
+def id_key(pid: str):
+    """
+    Sort key for ids: numeric ids in numeric order, then everything else.
+    """
+    return (0, int(pid), "") if pid.isdigit() else (1, 0, pid)
+
+
+def project(rows: Iterable[dict], columns: list) -> Iterator[dict]:
+    """
+    Keeps only `columns` from each row so wide records are not held in memory.
+    """
+    for row in rows:
+        yield {c: row.get(c) for c in columns}
+
+
+def iter_tsv(path: str, header: bool = True) -> Iterator:
+    """
+    Lazily yields TSV rows: dicts keyed by the header row (missing cells are
+    ""), or plain lists when header=False. Blank lines are skipped.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rdr = csv.reader(f, delimiter="\t")
+        if not header:
+            yield from (row for row in rdr if row)
+            return
+        cols = next(rdr, [])
+        n = len(cols)
+        for row in rdr:
+            if not row:
+                continue
+            if len(row) < n:
+                row = row + [""] * (n - len(row))
+            yield dict(zip(cols, row))
+
+
+def read_tsv_header(path: str) -> list:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f, delimiter="\t"), [])
@@ -0,0 +1,180 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import zlib
+from itertools import islice
+
+from .clarifier import extract_title
+from .compare_reviews import iter_comparison
+from .resilience import DeadLetter, is_request_error
+from .run_utils import add_model_args, add_resume_args, open_model, ordered_map, print_stats
+from .sharding import add_shard_args, take_shard
+
+# metric -> rubric line shown to the judge; order matches add_scoring_columns.py
+METRICS = {
+    "specificity": "1-5, how concretely the review points at specific code, lines or behaviour (1 = generic, 5 = precise)",
+    "actionability": "1-5, how clearly a developer could act on the feedback (1 = vague, 5 = every point has a clear fix)",
+    "assumption_identification": "integer count of assumptions or ambiguities in the PR that the review explicitly calls out",
+    "comment_quality": "1-5, overall correctness, relevance and clarity of the review",
+    "suggestions": "integer count of distinct concrete suggestions or requested changes",
+}
+SCORE_FIELDS = [f"{m}_{kind}" for m in METRICS for kind in ("baseline", "clarified")]
+OUTPUT_COLS = ["id", "pr_title"] + SCORE_FIELDS
+
+JUDGE_PROMPT = """You are grading two code reviews of the same pull request. Grade each review on its own merits.
+
+Pull request:
+{pr_text}
+
+### Review 1
+{review_1}
+
+### Review 2
+{review_2}
+
+Score each review on these metrics:
+{rubric}
+
+Return only a JSON object of this form:
+{{"review_1": {{{fields}}}, "review_2": {{{fields}}}}}
+"""
+
+# JSON output, greedy decoding so reruns give the same scores
+JUDGE_CONFIG = {"response_mime_type": "application/json", "temperature": 0}
+
+
+def review_order(pid: str):
+    """
+    Which review is shown first. Alternates by a stable hash of the id so
+    position bias averages out across the dataset but reruns are identical.
+    """
+    return ("baseline", "clarified") if zlib.crc32(pid.encode("utf-8")) % 2 == 0 else ("clarified", "baseline")
+
+
+def build_judge_prompt(row: dict) -> str:
+    first, second = review_order(row["id"])
+    return JUDGE_PROMPT.format(
+        pr_text=row.get("prompt", "").strip(),
+        review_1=row.get(f"{first}_review", "").strip(),
+        review_2=row.get(f"{second}_review", "").strip(),
+        rubric="\n".join(f"- {m}: {desc}" for m, desc in METRICS.items()),
+        fields=", ".join(f'"{m}": <int>' for m in METRICS),
+    )
+
+
+def parse_scores(text: str) -> dict:
+    """
+    Parses the judge's JSON into {"review_1": {metric: int}, "review_2": {...}}.
+    Metrics that are missing or not numbers are left out.
+    """
+    text = (text or "").strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.S)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    out = {}
+    for slot in ("review_1", "review_2"):
+        scores = data.get(slot) if isinstance(data, dict) else None
+        if not isinstance(scores, dict):
+            continue
+        out[slot] = {}
+        for m in METRICS:
+            try:
+                out[slot][m] = int(round(float(scores[m])))
+            except (KeyError, TypeError, ValueError):
+                pass
+    return out
+
+
+def score_row(model, row: dict) -> dict:
+    """
+    One judge call per PR; returns an eval_scored.tsv row. Scores the judge
+    did not return are left empty.
+    """
+    resp = model.generate_content(build_judge_prompt(row), generation_config=JUDGE_CONFIG)
+    parsed = parse_scores(resp.text)
+    out = {"id": row["id"], "pr_title": extract_title(row.get("prompt", ""))}
+    missing = 0
+    for slot, kind in zip(("review_1", "review_2"), review_order(row["id"])):
+        scores = parsed.get(slot, {})
+        for m in METRICS:
+            out[f"{m}_{kind}"] = scores.get(m, "")
+            missing += m not in scores
+    if missing:
+        sys.stderr.write(f"[WARN] id={row['id']}: judge returned {missing} unusable scores, left empty\n")
+    return out
+
+
+def scored_ids(path: str) -> set:
+    """
+    Ids already in an eval_scored.tsv. A torn final line is truncated away
+    so appending resumes at a row boundary.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        if not data.endswith(b"\n"):
+            cut = data.rfind(b"\n") + 1
+            sys.stderr.write(f"[WARN] Truncating torn final line at byte {cut} of {path}\n")
+            f.truncate(cut)
+    with open(path, encoding="utf-8", newline="") as f:
+        return {row["id"] for row in csv.DictReader(f, delimiter="\t")}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Score baseline vs clarified reviews with an LLM judge -> eval_scored.tsv")
+    ap.add_argument("--input", required=True, help="comparison.tsv from compare_reviews.py")
+    ap.add_argument("--output", required=True, help="Path to write eval_scored.tsv")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--judge_model", default="gemini-1.5-flash", help="Model that grades the reviews")
+    add_model_args(ap)
+    add_resume_args(ap)
+    add_shard_args(ap)
+    args = ap.parse_args(argv)
+
+    model = open_model(args, args.judge_model, "judge")
+    done = scored_ids(args.output) if args.resume else set()
+    if done:
+        print(f"[RESUME] {len(done)} ids already in {args.output}")
+
+    rows = take_shard(islice(iter_comparison(args.input), args.limit), args.shard_index, args.shard_count)
+    rows = (r for r in rows if r["id"] not in done)
+    dead = DeadLetter(args.dead_letter)
+
+    def judge_one(row):
+        try:
+            return score_row(model, row)
+        except Exception as e:
+            if not is_request_error(e):
+                raise
+            dead.record(row, e)
+            return None
+
+    wrote = 0
+    with open(args.output, "a" if done else "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=OUTPUT_COLS, delimiter="\t", lineterminator="\n")
+        if not done:
+            w.writeheader()
+        for out in ordered_map(judge_one, rows, args.concurrency):
+            if out is None:
+                continue
+            w.writerow(out)
+            f.flush()
+            wrote += 1
+            if args.fsync_every and wrote % args.fsync_every == 0:
+                os.fsync(f.fileno())
+
+    dead.report()
+    print(f"[JUDGE] wrote {wrote} rows -> {args.output}")
+    print_stats("JUDGE", model)
+
+
+if __name__ == "__main__":
+    main()
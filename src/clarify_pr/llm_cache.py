@@ -0,0 +1,227 @@
+import atexit
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_PATH = BASE / ".cache" / "llm_cache.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def config_hash(config) -> str:
+    """
+    Stable hash of a generation config (dict, proto-like object or None).
+    """
+    if config is None:
+        return ""
+    if not isinstance(config, dict):
+        config = getattr(config, "__dict__", None) or str(config)
+    blob = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def cache_key(backend: str, model_name: str, prompt: str, config=None) -> str:
+    blob = json.dumps([backend, model_name, prompt, config_hash(config)], ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for a GenerativeModel response served from the cache.
+    """
+    cached = True
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ResponseCache:
+    """
+    Content-addressed response store in a single SQLite file.
+    Entries older than max_age_days are dropped; once the stored text exceeds
+    max_bytes, the least recently used entries are evicted. Hits update the
+    access time in memory; it is written in batches (and before evicting or
+    at exit) so a hit costs no write transaction.
+    """
+    touch_batch = 256
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes: int = 1 << 30, max_age_days: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_days * 86400 if max_age_days else None
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        self._db.commit()
+        self._writes = 0
+        self._touched = {}
+        self.evict()
+        atexit.register(self.flush)
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._db.execute("SELECT text, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            text, created = row
+            now = time.time()
+            if self.max_age_s and now - created > self.max_age_s:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touches()
+                self._db.commit()
+            return text
+
+    def put(self, key: str, model_name: str, text: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, text, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, text, len(text.encode("utf-8")), now, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touches()
+            self._db.commit()
+            self._writes += 1
+            check = self._writes % 256 == 0
+        if check:
+            self.evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._touched.pop(key, None)
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _flush_touches(self):
+        """
+        Writes pending access times; the caller holds the lock and commits.
+        """
+        if self._touched:
+            self._db.executemany("UPDATE responses SET accessed = ? WHERE key = ?",
+                                 [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    def flush(self):
+        with self._lock:
+            if self._touched:
+                self._flush_touches()
+                self._db.commit()
+
+    def evict(self):
+        with self._lock:
+            self._flush_touches()
+            if self.max_age_s:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.max_age_s,))
+            if self.max_bytes:
+                total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    freed = 0
+                    doomed = []
+                    for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                        doomed.append((key,))
+                        freed += size
+                        if freed >= excess:
+                            break
+                    self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            self._db.commit()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._db.close()
+
+
+class CachedModel:
+    """
+    Wraps a model exposing generate_content() and serves repeated
+    (backend, model name, prompt, generation config) requests from a ResponseCache.
+    Concurrent identical requests are collapsed into one network call.
+    """
+
+    def __init__(self, inner, backend: str, model_name: str, cache: ResponseCache):
+        self.inner = inner
+        self.backend = backend
+        self.model_name = model_name
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def generate_content(self, prompt, **kwargs):
+        key = cache_key(self.backend, self.model_name, prompt, kwargs or None)
+        while True:
+            text = self.cache.get(key)
+            if text is not None:
+                with self._lock:
+                    self.hits += 1
+                return CachedResponse(text)
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # someone else is fetching the same prompt; wait and re-check the cache
+            waiter.wait()
+
+        try:
+            resp = self.inner.generate_content(prompt, **kwargs)
+            text = resp.text or ""
+            self.cache.put(key, self.model_name, text)
+            return resp
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def generate_stream(self, prompt, **kwargs):
+        """
+        Streaming variant sharing the same cache entries. A hit is replayed
+        as one chunk; a miss is stored only if the stream ran to the end.
+        """
+        key = cache_key(self.backend, self.model_name, prompt, kwargs or None)
+        text = self.cache.get(key)
+        if text is not None:
+            with self._lock:
+                self.hits += 1
+            yield CachedResponse(text)
+            return
+        with self._lock:
+            self.misses += 1
+        parts = []
+        for chunk in self.inner.generate_stream(prompt, **kwargs):
+            parts.append(chunk.text or "")
+            yield chunk
+        self.cache.put(key, self.model_name, "".join(parts))
+
+    def forget(self, prompt, **kwargs):
+        """
+        Drops the cached response for this request, e.g. one the caller
+        could not use, so the next run asks the model again.
+        """
+        self.cache.delete(cache_key(self.backend, self.model_name, prompt, kwargs or None))
+
+    def stats(self) -> dict:
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
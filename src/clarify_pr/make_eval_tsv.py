@@ -0,0 +1,67 @@
+import csv
+import argparse
+import pathlib
+
+from .io_utils import iter_tsv, read_tsv_header
+from .qa_io import load_answers_any
+
+
+def read_qs(path):
+    q = {}
+    for r in iter_tsv(path):
+        _id = int(r["id"])
+        qstr = (r["clarify_questions"] or "").strip()
+        qstr = " | ".join([s.strip() for s in qstr.replace("\r\n","\n").split("\n") if s.strip()])
+        q[_id] = qstr
+    return q
+
+
+def read_ans(path):
+    # wide sheets (id<TAB>answers) go through the same loader as clarified.py;
+    # tall ones, with or without a header, keep the last row of each id
+    header = read_tsv_header(path)
+    cols = [c.lower() for c in header]
+    if "answers" in cols:
+        rows = ((_id, " ".join(answers)) for _id, answers in load_answers_any(path).items())
+    elif "id" in cols and "answer" in cols:
+        id_col, ans_col = header[cols.index("id")], header[cols.index("answer")]
+        rows = ((r[id_col], r[ans_col]) for r in iter_tsv(path))
+    else:
+        rows = (r[:2] for r in iter_tsv(path, header=False) if len(r) >= 2)
+    a = {}
+    for _id, ans in rows:
+        ans = (ans or "").strip()
+        a[int(_id)] = " ".join(ans.replace("\r\n","\n").split("\n"))  # one line
+    return a
+
+
+def build_eval_tsv(qs_path, ans_path, out_path):
+    qmap = read_qs(qs_path)
+    amap = read_ans(ans_path)
+    ids = sorted(set(qmap.keys()) | set(amap.keys()))
+    pathlib.Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        fieldnames = ["id","clarify_questions","answer","clarified_suggestion","baseline_suggestion"]
+        w = csv.DictWriter(f, fieldnames=fieldnames, delimiter="\t")
+        w.writeheader()
+        for i in ids:
+            w.writerow({
+                "id": i,
+                "clarify_questions": qmap.get(i, ""),
+                "answer": amap.get(i, ""),
+                "clarified_suggestion": "",
+                "baseline_suggestion": "",
+            })
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--questions", required=True)
+    ap.add_argument("--answers", required=True)
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args(argv)
+    build_eval_tsv(args.questions, args.answers, args.out)
+
+
+if __name__ == "__main__":
+    main()
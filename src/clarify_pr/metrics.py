@@ -0,0 +1,120 @@
+import json
+import math
+import threading
+import time
+
+
+def percentile(xs, p):
+    """
+    Nearest-rank percentile of xs (p in 0..100); nan when xs is empty.
+    """
+    if not xs:
+        return float("nan")
+    xs = sorted(xs)
+    return xs[max(0, math.ceil(p / 100 * len(xs)) - 1)]
+
+
+class MetricsSink:
+    """
+    Thread-safe JSONL writer for per-call metric records.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, rec: dict):
+        line = json.dumps(rec) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+
+def usage_tokens(resp):
+    """
+    Returns (input_tokens, output_tokens) from a response's usage_metadata, or (None, None).
+    """
+    usage = getattr(resp, "usage_metadata", None)
+    if usage is None:
+        return None, None
+    return getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None)
+
+
+class InstrumentedModel:
+    """
+    Wraps a model exposing generate_content() and emits one metrics record per
+    call: start time, latency, prompt size, token usage, cache hit and error class.
+    """
+
+    def __init__(self, inner, model_name: str, script: str, sink: MetricsSink):
+        self.inner = inner
+        self.model_name = model_name
+        self.script = script
+        self.sink = sink
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _record(self, start: float, latency: float, prompt: str, resp, error, **extra):
+        input_tokens, output_tokens = usage_tokens(resp)
+        with self._lock:
+            self.calls += 1
+            self.errors += error is not None
+        self.sink.emit({
+            "ts": start,
+            "script": self.script,
+            "model": self.model_name,
+            "latency_s": round(latency, 6),
+            "prompt_chars": len(prompt),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_hit": bool(getattr(resp, "cached", False)),
+            "error": error,
+            **extra,
+        })
+
+    def generate_content(self, prompt, **kwargs):
+        start = time.time()
+        t0 = time.perf_counter()
+        resp, error = None, None
+        try:
+            resp = self.inner.generate_content(prompt, **kwargs)
+            return resp
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record(start, time.perf_counter() - t0, prompt, resp, error)
+
+    def generate_stream(self, prompt, **kwargs):
+        """
+        Streaming variant; the record adds time to first chunk (ttft_s) and
+        whether the consumer stopped the stream early. Token usage comes
+        from the last chunk that carries usage_metadata.
+        """
+        start = time.time()
+        t0 = time.perf_counter()
+        ttft, last, error, complete = None, None, None, False
+        try:
+            for chunk in self.inner.generate_stream(prompt, **kwargs):
+                if ttft is None:
+                    ttft = time.perf_counter() - t0
+                if getattr(chunk, "usage_metadata", None) is not None or last is None:
+                    last = chunk
+                yield chunk
+            complete = True
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record(start, time.perf_counter() - t0, prompt, last, error,
+                         stream=True, ttft_s=None if ttft is None else round(ttft, 6),
+                         stopped_early=not complete and error is None)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "errors": self.errors}
@@ -0,0 +1,144 @@
+import json
+import re
+import sys
+import threading
+from typing import Iterable, Iterator, List, Tuple
+
+from .resilience import is_request_error, payload_id
+from .run_utils import ordered_map
+
+PACKED_PROMPT = """You will receive {n} independent tasks, each starting with a "### Task <n>" header.
+Complete every task on its own, exactly as its instructions say; do not mix content between tasks.
+Return only a JSON array with one object per task, in order:
+[{{"task": <n>, "review": "<your complete answer for that task>"}}, ...]
+
+{tasks}
+"""
+
+TASK_BLOCK = "### Task {n}\n{prompt}"
+
+# ask Gemini for raw JSON instead of prose
+PACKED_CONFIG = {"response_mime_type": "application/json"}
+
+
+def pack_prompt(prompts: List[str]) -> str:
+    tasks = "\n\n".join(TASK_BLOCK.format(n=i, prompt=p.strip()) for i, p in enumerate(prompts, start=1))
+    return PACKED_PROMPT.format(n=len(prompts), tasks=tasks)
+
+
+def parse_packed(text: str, n: int) -> dict:
+    """
+    Parses a packed response into {task number: review}. Entries that are
+    missing, malformed or out of range are left out so the caller can retry
+    them one by one.
+    """
+    text = (text or "").strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.S)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    if isinstance(data, dict):
+        data = data.get("tasks") or data.get("reviews") or []
+    out = {}
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            num = int(item.get("task"))
+        except (TypeError, ValueError):
+            continue
+        review = item.get("review")
+        if 1 <= num <= n and isinstance(review, str) and review.strip():
+            out[num] = review.strip()
+    return out
+
+
+def _forget(model, prompt: str, **kwargs):
+    """
+    Drops a response from every cache layer around the model (see
+    llm_cache.CachedModel.forget), so an unusable answer is not replayed.
+    """
+    while model is not None:
+        if hasattr(model, "forget"):
+            model.forget(prompt, **kwargs)
+        model = getattr(model, "inner", None)
+
+
+def _packs(requests: Iterable[Tuple[str, object]], k: int, fits) -> Iterator[list]:
+    """
+    Groups requests greedily, in order, into packs of at most K whose packed
+    prompt still `fits`; a request that fits with nothing else is a pack of one.
+    """
+    cur = []
+    for req in requests:
+        if cur and (len(cur) == k or not fits(pack_prompt([p for p, _ in cur] + [req[0]]))):
+            yield cur
+            cur = []
+        cur.append(req)
+    if cur:
+        yield cur
+
+
+def packed_map(model, requests: Iterable[Tuple[str, object]], k: int, concurrency: int = 1,
+               dead=None, single=None, fits=None) -> Iterator[Tuple[object, str]]:
+    """
+    Sends requests (prompt, payload) up to K at a time in one packed call and
+    yields (payload, review) in input order. Packs are cut short where the
+    packed prompt would no longer pass `fits`. Any request whose packed answer
+    is missing or unparsable (or whose packed call failed) is re-sent on its
+    own, and a packed answer that did not parse in full is dropped from the
+    response cache; if that fails too with a request error (resilience.is_request_error)
+    it goes to `dead` (a resilience.DeadLetter) and is skipped; other errors
+    are raised. `single(prompt, payload)` reviews one request (default: one
+    plain model call).
+    """
+    if single is None:
+        def single(prompt, payload):
+            return (model.generate_content(prompt).text or "").strip()
+    fits = fits or (lambda prompt: True)
+    stats = {"packed_calls": 0, "packed_failures": 0, "fallback_calls": 0}
+    lock = threading.Lock()
+
+    def count(key):
+        with lock:
+            stats[key] += 1
+
+    def run_pack(chunk):
+        reviews = {}
+        if len(chunk) > 1:
+            count("packed_calls")
+            try:
+                prompt = pack_prompt([p for p, _ in chunk])
+                resp = model.generate_content(prompt, generation_config=PACKED_CONFIG)
+                reviews = parse_packed(resp.text, len(chunk))
+                if len(reviews) < len(chunk):
+                    _forget(model, prompt, generation_config=PACKED_CONFIG)
+            except Exception as e:
+                if not is_request_error(e):
+                    raise
+                # every task falls back to a single request
+                count("packed_failures")
+                ids = ",".join(str(payload_id(payload)) for _, payload in chunk)
+                sys.stderr.write(f"[WARN] packed call for ids={ids} failed, sending them one by one: "
+                                 f"{type(e).__name__}: {str(e)[:500]}\n")
+        out = []
+        for i, (prompt, payload) in enumerate(chunk, start=1):
+            if i not in reviews:
+                count("fallback_calls")
+                try:
+                    reviews[i] = single(prompt, payload)
+                except Exception as e:
+                    if dead is None or not is_request_error(e):
+                        raise
+                    dead.record(payload, e)
+                    continue
+            out.append((payload, reviews[i]))
+        return out
+
+    for results in ordered_map(run_pack, _packs(requests, k, fits), concurrency):
+        yield from results
+    print(f"[PACK] packed_calls={stats['packed_calls']} packed_failures={stats['packed_failures']} "
+          f"fallback_calls={stats['fallback_calls']}")
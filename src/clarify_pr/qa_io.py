@@ -0,0 +1,102 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from .io_utils import iter_tsv, read_tsv_header
+
+
+def parse_multiline_questions(cell: str) -> List[str]:
+    """
+    Accepts text like:
+      Q1: Which envs...?
+      Q2: Does this affect...?
+    Returns ["Which envs...?", "Does this affect...?"]
+    """
+    if not isinstance(cell, str):
+        return []
+    qs = []
+    for ln in cell.splitlines():
+        ln = ln.strip()
+        if ln.lower().startswith("q") and ":" in ln[:5]:
+            ln = ln.split(":", 1)[1].strip()
+        if ln.endswith("?") and len(ln) > 3:
+            qs.append(ln)
+    return qs
+
+
+def parse_answers_wide(cell: str) -> List[str]:
+    """
+    Accepts text like:
+      A1: Staging only
+      A2: No mobile impact
+    Returns ["Staging only", "No mobile impact"]
+    """
+    if not isinstance(cell, str):
+        return []
+    ans = []
+    for ln in cell.splitlines():
+        ln = ln.strip()
+        if ln.lower().startswith("a") and ":" in ln[:5]:
+            ln = ln.split(":", 1)[1].strip()
+        if ln:
+            ans.append(ln)
+    return ans
+
+
+def load_questions_tsv(path: str) -> Dict[str, dict]:
+    """
+    Expected header: id<TAB>pr_title<TAB>clarify_questions
+    Returns map[id] -> {"pr_title": str, "questions": [q1, q2, ...]}
+    """
+    required = {"id", "pr_title", "clarify_questions"}
+    if not required.issubset(set(read_tsv_header(path))):
+        raise ValueError(f"{path} must have columns: id, pr_title, clarify_questions")
+    out = {}
+    for row in iter_tsv(path):
+        out[row["id"]] = {
+            "pr_title": row["pr_title"],
+            "questions": parse_multiline_questions(row["clarify_questions"]),
+        }
+    return out
+
+
+def load_answers_any(path: str) -> Dict[str, List[str]]:
+    """
+    Supports three formats:
+
+    Wide (header):
+      id<TAB>answers
+      1  <A1...\\nA2...>
+
+    Tall (id<TAB>answer rows):
+      id<TAB>answer
+      1  Staging only
+      1  No mobile impact
+
+    Headerless tall: the same two columns without a header row.
+    """
+    header = read_tsv_header(path)
+    cols = [c.lower() for c in header]
+
+    if "answers" in cols and "id" in cols:
+        id_col = header[cols.index("id")]
+        ans_col = header[cols.index("answers")]
+        return {row[id_col]: parse_answers_wide(row[ans_col]) for row in iter_tsv(path)}
+
+    if "id" in cols and "answer" in cols:
+        id_col = header[cols.index("id")]
+        ans_col = header[cols.index("answer")]
+        pairs = ((row[id_col], row[ans_col]) for row in iter_tsv(path))
+    elif len(header) == 2:
+        pairs = (tuple(row[:2]) for row in iter_tsv(path, header=False) if len(row) >= 2)
+    else:
+        raise ValueError(
+            f"Unrecognized answers format in {path}. "
+            "Use either: (1) id<TAB>answers (newline-separated A1/A2), or (2) id<TAB>answer per row."
+        )
+
+    amap = defaultdict(list)
+    for pid, val in pairs:
+        val = val.strip()
+        if val:
+            amap[pid].append(val)
+    return dict(amap)
@@ -0,0 +1,341 @@
+import json
+import random
+import sys
+import threading
+import time
+
+from .metrics import usage_tokens
+
+THROTTLE_CODES = {429}
+TRANSIENT_CODES = {408, 500, 502, 503, 504}
+THROTTLE_NAMES = {"ResourceExhausted", "TooManyRequests"}
+TRANSIENT_NAMES = {"ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout",
+                   "BadGateway", "TimeoutError", "ConnectionError", "ConnectionResetError"}
+# Gemini refused to answer this prompt (safety block, stopped candidate)
+REJECTED_NAMES = {"BlockedPromptException", "StopCandidateException"}
+AIMD_COOLDOWN_S = 1.0  # at most one multiplicative decrease per cooldown
+
+
+def classify_error(e: Exception) -> str:
+    """
+    "throttle" (429 / quota), "transient" (5xx, timeouts, dropped connections)
+    or "fatal" (anything a retry will not fix).
+    """
+    code = getattr(e, "code", None)
+    if not callable(code) and code is not None:
+        try:
+            code = int(code)
+        except (TypeError, ValueError):
+            code = None
+        if code in THROTTLE_CODES:
+            return "throttle"
+        if code in TRANSIENT_CODES:
+            return "transient"
+    names = {cls.__name__ for cls in type(e).__mro__}
+    if names & THROTTLE_NAMES:
+        return "throttle"
+    if names & TRANSIENT_NAMES:
+        return "transient"
+    return "fatal"
+
+
+class RequestError(Exception):
+    """
+    A request that cannot be answered as given, e.g. a PR with nothing to
+    review. Dead-lettered like a failed API call.
+    """
+
+
+def is_request_error(e: Exception) -> bool:
+    """
+    True for failures of one request: throttling, transient errors, API
+    errors with an HTTP status, prompts the model refused and RequestError.
+    Anything else is a bug in this code and should be raised, not skipped.
+    """
+    if isinstance(e, RequestError) or classify_error(e) != "fatal":
+        return True
+    code = getattr(e, "code", None)
+    if isinstance(code, int) and 400 <= code < 600:
+        return True
+    return bool({cls.__name__ for cls in type(e).__mro__} & REJECTED_NAMES)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute` units per minute up to one minute's worth.
+    A request larger than the bucket waits for a full bucket and overdraws it.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, n: float = 1.0, block: bool = True) -> bool:
+        """
+        Takes n units, waiting for them unless `block` is False; returns
+        whether they were taken.
+        """
+        need = min(n, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.level >= need:
+                    self.level -= n
+                    return True
+                wait = (need - self.level) / self.rate
+            if not block:
+                return False
+            time.sleep(wait)
+
+    def adjust(self, n: float):
+        """
+        Charges (n > 0) or refunds (n < 0) units once the real cost is known.
+        """
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level - n)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit that grows by one per window of successes and halves on
+    throttling, between 1 and `max_limit`.
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.inflight = 0
+        self.last_cut = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Takes a slot, waiting at most `timeout` seconds (None: no limit);
+        returns whether it was taken.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.inflight < int(self.limit), timeout):
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.inflight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_throttle(self):
+        with self._cond:
+            now = time.monotonic()
+            if now - self.last_cut >= AIMD_COOLDOWN_S:
+                self.limit = max(1.0, self.limit / 2)
+                self.last_cut = now
+
+
+class Admission:
+    """
+    Request/token rate limits and AIMD concurrency shared by every call that
+    reaches the backend. A call holds its slot from acquire() until release(),
+    so a call abandoned by its caller keeps counting until it really ends.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, max_concurrency: int = 1):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.limiter = AIMDLimiter(max_concurrency)
+
+    def acquire(self, estimate: int, block: bool = True, timeout: float | None = None) -> bool:
+        """
+        Waits for a request token, `estimate` tokens and a concurrency slot.
+        With block=False it takes them only if all are free now; `timeout`
+        bounds the wait for the slot. Returns whether the call was admitted.
+        """
+        if self.requests and not self.requests.acquire(1, block):
+            return False
+        if self.tokens and not self.tokens.acquire(estimate, block):
+            if self.requests:
+                self.requests.adjust(-1)
+            return False
+        if not self.limiter.acquire(timeout if block else 0):
+            if self.requests:
+                self.requests.adjust(-1)
+            if self.tokens:
+                self.tokens.adjust(-estimate)
+            return False
+        return True
+
+    def release(self, estimate: int, resp=None, error: Exception | None = None):
+        """
+        Frees the slot and feeds the outcome back: throttling halves the
+        concurrency limit, a success grows it and settles the token estimate.
+        """
+        self.limiter.release()
+        if error is not None:
+            if classify_error(error) == "throttle":
+                self.limiter.on_throttle()
+            return
+        self.limiter.on_success()
+        if self.tokens and resp is not None:
+            input_tokens, output_tokens = usage_tokens(resp)
+            self.tokens.adjust((input_tokens or estimate) + (output_tokens or 0) - estimate)
+
+    def call(self, fn, prompt, kwargs):
+        estimate = estimate_tokens(prompt)
+        self.acquire(estimate)
+        try:
+            resp = fn(prompt, **kwargs)
+        except Exception as e:
+            self.release(estimate, error=e)
+            raise
+        self.release(estimate, resp)
+        return resp
+
+    def stream(self, fn, prompt, kwargs):
+        estimate = estimate_tokens(prompt)
+        self.acquire(estimate)
+        try:
+            yield from fn(prompt, **kwargs)
+        except Exception as e:
+            self.release(estimate, error=e)
+            raise
+        except BaseException:  # GeneratorExit: the consumer stopped early
+            self.limiter.release()
+            raise
+        self.release(estimate)
+
+
+class ResilientModel:
+    """
+    Wraps a model exposing generate_content() with request/token rate limits,
+    AIMD concurrency and jittered exponential backoff. Throttling and
+    transient errors are retried up to `max_retries` times; other errors and
+    exhausted retries are raised to the caller. If the inner model admits its
+    own calls (it has an `admission`, like HedgedModel), that one is used and
+    the limits given here are ignored.
+    """
+
+    def __init__(self, inner, rpm: float = 0, tpm: float = 0, max_concurrency: int = 1,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.inner = inner
+        self.admits_inner = getattr(inner, "admission", None) is not None
+        self.admission = inner.admission if self.admits_inner else Admission(rpm, tpm, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": uniform over [0, capped exponential]
+        with self._lock:
+            return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _should_retry(self, e: Exception, attempt: int) -> bool:
+        kind = classify_error(e)
+        if kind == "throttle":
+            with self._lock:
+                self.throttled += 1
+        if kind == "fatal" or attempt >= self.max_retries:
+            return False
+        with self._lock:
+            self.retries += 1
+        return True
+
+    def generate_content(self, prompt, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                if self.admits_inner:
+                    return self.inner.generate_content(prompt, **kwargs)
+                return self.admission.call(self.inner.generate_content, prompt, kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def generate_stream(self, prompt, **kwargs):
+        """
+        Streaming variant. Only failures before the first chunk are retried;
+        the concurrency slot is held until the stream ends or is closed.
+        """
+        attempt = 0
+        while True:
+            started = False
+            try:
+                chunks = (self.inner.generate_stream(prompt, **kwargs) if self.admits_inner
+                          else self.admission.stream(self.inner.generate_stream, prompt, kwargs))
+                for chunk in chunks:
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not self._should_retry(e, attempt):
+                    raise
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def stats(self) -> dict:
+        return {"retries": self.retries, "throttled": self.throttled,
+                "concurrency_limit": int(self.admission.limiter.limit)}
+
+
+def payload_record(payload):
+    """
+    The record inside a request payload: a record dict, or a tuple ending in one.
+    """
+    if isinstance(payload, tuple) and payload:
+        payload = payload[-1]
+    return payload if isinstance(payload, dict) else {}
+
+
+def payload_id(payload):
+    return payload_record(payload).get("id")
+
+
+class DeadLetter:
+    """
+    Records requests that failed for good: a warning on stderr and, with a
+    path, one JSON line per failure. Those ids are absent from the output,
+    so a later --resume run retries them.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, payload, error: Exception):
+        pid = payload_id(payload)
+        rec = {"ts": time.time(), "id": pid, "error": type(error).__name__, "message": str(error)[:500]}
+        sys.stderr.write(f"[WARN] id={pid} failed permanently: {rec['error']}: {rec['message']}\n")
+        with self._lock:
+            self.count += 1
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def report(self):
+        if self.count:
+            where = f" (listed in {self.path})" if self.path else ""
+            sys.stderr.write(f"[WARN] {self.count} requests failed permanently{where}; rerun with --resume to retry them\n")
@@ -0,0 +1,291 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .io_utils import iter_jsonl, iter_tsv, project
+
+INDEX_SUFFIX = ".idx"
+HEAD_BYTES = 4096  # prefix checksummed to notice a rewritten (not appended) file
+PARQUET_BATCH_ROWS = 10_000
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("[error] Parquet stores need pyarrow: pip install pyarrow")
+    return pa, pq
+
+
+# Sidecar id index for JSONL
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _head_crc(mm, n: int) -> int:
+    return zlib.crc32(mm[:n])
+
+
+def _scan_offsets(mm, start: int, end: int, offsets: Dict[str, list], path: str):
+    pos = start
+    while pos < end:
+        nl = mm.find(b"\n", pos, end)
+        if nl < 0:
+            break  # torn final line; picked up once it is completed
+        line = mm[pos:nl]
+        if line.strip():
+            try:
+                offsets[str(json.loads(line).get("id"))] = [pos, nl - pos]
+            except ValueError:
+                sys.stderr.write(f"[WARN] Bad JSON at byte {pos} of {path}, not indexed\n")
+        pos = nl + 1
+    return pos
+
+
+def update_index(path: str) -> Dict[str, list]:
+    """
+    Returns {id: [byte offset, length]} for a JSONL file, kept in a sidecar
+    `<path>.idx`. Appended files are indexed from where the last index ended;
+    truncated or rewritten files are indexed from scratch. Later duplicates
+    of an id win, matching how --resume redoes records.
+    """
+    size = os.path.getsize(path)
+    idx_file = index_path(path)
+    idx = None
+    if os.path.exists(idx_file):
+        with open(idx_file, encoding="utf-8") as f:
+            idx = json.load(f)
+    if size == 0:
+        offsets, end, head_len, head_crc = {}, 0, 0, zlib.crc32(b"")
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            fresh = idx is None or idx["size"] > size or _head_crc(mm, idx["head_len"]) != idx["head_crc"]
+            offsets = {} if fresh else idx["offsets"]
+            start = 0 if fresh else idx["size"]
+            if idx is not None and not fresh and start == size:
+                return offsets
+            end = _scan_offsets(mm, start, size, offsets, path)
+            head_len = min(end, HEAD_BYTES)
+            head_crc = _head_crc(mm, head_len)
+    tmp = idx_file + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"size": end, "head_len": head_len, "head_crc": head_crc, "offsets": offsets}, f)
+    os.replace(tmp, idx_file)
+    return offsets
+
+
+class JsonlStore:
+    """
+    Random access to a JSONL result file by id through its sidecar index and
+    an mmap of the file; only the requested line is parsed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets = update_index(path)
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else None
+
+    def __contains__(self, pid) -> bool:
+        return str(pid) in self.offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def ids(self) -> List[str]:
+        return list(self.offsets)
+
+    def raw(self, pid) -> Optional[bytes]:
+        """
+        The record's JSON line as stored, without the newline.
+        """
+        loc = self.offsets.get(str(pid))
+        if loc is None:
+            return None
+        start, length = loc
+        return self._mm[start:start + length]
+
+    def get(self, pid, columns: Optional[list] = None) -> Optional[dict]:
+        line = self.raw(pid)
+        if line is None:
+            return None
+        rec = json.loads(line)
+        return {c: rec.get(c) for c in columns} if columns else rec
+
+    def scan(self, columns: Optional[list] = None) -> Iterator[dict]:
+        rows = iter_jsonl(self.path)
+        return project(rows, columns) if columns else rows
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Parquet
+
+class ParquetStore:
+    """
+    Columnar store over a Parquet file. Scans read only the requested
+    columns; get() reads the id column once, then one row group per lookup.
+    """
+
+    def __init__(self, path: str):
+        _, pq = _pyarrow()
+        self.path = path
+        self.file = pq.ParquetFile(path)
+        self.columns = list(self.file.schema_arrow.names)
+        self._locs: Optional[Dict[str, Tuple[int, int]]] = None
+        self._group = (None, None)
+
+    def _index(self) -> Dict[str, Tuple[int, int]]:
+        if self._locs is None:
+            self._locs = {}
+            for rg in range(self.file.num_row_groups):
+                ids = self.file.read_row_group(rg, columns=["id"]).column("id").to_pylist()
+                for i, pid in enumerate(ids):
+                    self._locs[str(pid)] = (rg, i)
+        return self._locs
+
+    def __contains__(self, pid) -> bool:
+        return str(pid) in self._index()
+
+    def __len__(self) -> int:
+        return self.file.metadata.num_rows
+
+    def ids(self) -> List[str]:
+        return list(self._index())
+
+    def get(self, pid, columns: Optional[list] = None) -> Optional[dict]:
+        loc = self._index().get(str(pid))
+        if loc is None:
+            return None
+        rg, i = loc
+        if self._group[0] != rg:
+            self._group = (rg, self.file.read_row_group(rg))
+        rec = self._group[1].slice(i, 1).to_pylist()[0]
+        return {c: rec.get(c) for c in columns} if columns else rec
+
+    def scan(self, columns: Optional[list] = None) -> Iterator[dict]:
+        for batch in self.file.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=columns):
+            yield from batch.to_pylist()
+
+    def read_columns(self, columns: list) -> Dict[str, list]:
+        return self.file.read(columns=columns).to_pydict()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetRowWriter:
+    """
+    Writes dict rows to Parquet in row groups of `batch_rows`. The schema is
+    taken from the first batch; keys that appear only later are dropped.
+    """
+
+    def __init__(self, path: str, batch_rows: int = PARQUET_BATCH_ROWS):
+        self.pa, self.pq = _pyarrow()
+        self.path = path
+        self.batch_rows = batch_rows
+        self.rows = []
+        self.writer = None
+        self.count = 0
+
+    def write(self, row: dict):
+        self.rows.append(row)
+        self.count += 1
+        if len(self.rows) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self.rows:
+            return
+        if self.writer is None:
+            table = self.pa.Table.from_pylist(self.rows)
+            self.writer = self.pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        else:
+            table = self.pa.Table.from_pylist(self.rows, schema=self.writer.schema)
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_parquet(path) -> bool:
+    return str(path).endswith(".parquet")
+
+
+def open_store(path: str):
+    return ParquetStore(path) if is_parquet(path) else JsonlStore(path)
+
+
+def to_parquet(src: str, dst: str) -> int:
+    """
+    Converts a JSONL or TSV result file to Parquet, with ids as strings.
+    """
+    rows = iter_tsv(src) if src.endswith(".tsv") else iter_jsonl(src)
+    with ParquetRowWriter(dst) as w:
+        for row in rows:
+            if "id" in row:
+                row["id"] = str(row["id"])
+            w.write(row)
+    return w.count
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Index, look up and convert result files (JSONL / Parquet).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("index", help="Build or refresh the sidecar id index of JSONL files")
+    p.add_argument("paths", nargs="+")
+    p = sub.add_parser("get", help="Print the record for one id")
+    p.add_argument("path")
+    p.add_argument("--id", required=True)
+    p.add_argument("--columns", default="", help="Comma-separated columns to print (default: all)")
+    p = sub.add_parser("to-parquet", help="Convert a JSONL or TSV result file to Parquet")
+    p.add_argument("input")
+    p.add_argument("output")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "index":
+        for path in args.paths:
+            print(f"[INDEX] {len(update_index(path))} ids -> {index_path(path)}")
+    elif args.cmd == "get":
+        with open_store(args.path) as store:
+            rec = store.get(args.id, [c for c in args.columns.split(",") if c] or None)
+        if rec is None:
+            raise SystemExit(f"[error] id {args.id!r} not in {args.path}")
+        print(json.dumps(rec, ensure_ascii=False, indent=2))
+    else:
+        n = to_parquet(args.input, args.output)
+        print(f"[PARQUET] wrote {n} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import contextlib
+
+from .baseline import build_baseline_request
+from .clarified import build_review_request
+from .gating import baseline_only_ids
+from .io_utils import iter_jsonl
+from .qa_io import load_answers_any, load_questions_tsv
+from .run_utils import add_run_args, generate_reviews, iter_output, open_model, open_output, print_stats
+from .sharding import take_shard
+
+
+def plan_tasks(prs, qmap, amap, done_baseline: set, done_clarified: set):
+    """
+    Yields (prompt, (kind, record)) for every review still missing, baseline
+    and clarified for the same PR back to back so both run concurrently.
+    """
+    for obj in prs:
+        pid = str(obj.get("id"))
+        if pid not in done_baseline:
+            prompt, rec = build_baseline_request(obj)
+            yield prompt, ("baseline", rec)
+        if pid not in done_clarified:
+            req = build_review_request(obj, qmap, amap)
+            if req is not None:
+                yield req[0], ("clarified", req[1])
+
+
+def combined_progress(path: str):
+    """
+    Reads a combined output for --resume. Returns ({kind: ids whose row holds
+    that review, not truncated}, {id: latest row missing a review}); a later
+    row for an id supersedes earlier ones.
+    """
+    rows = {}
+    for obj in iter_output(path):
+        pid = str(obj.get("id"))
+        rows[pid] = {**rows.get(pid, {}), **obj}
+    done = {kind: {pid for pid, row in rows.items() if f"{kind}_review" in row and not row.get(f"{kind}_truncated")}
+            for kind in ("baseline", "clarified")}
+    partial = {pid: row for pid, row in rows.items() if any(pid not in ids for ids in done.values())}
+    return done, partial
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Baseline + clarified review in a single pass over the PRs.")
+    ap.add_argument("--input", required=True, help="PR JSONL with {id, pr_text|prompt}")
+    ap.add_argument("--questions", required=True, help="TSV with columns: id, pr_title, clarify_questions")
+    ap.add_argument("--answers", required=True, help="Answers TSV (wide or tall)")
+    ap.add_argument("--baseline_output", help="Output JSONL for baseline reviews (baseline.py format)")
+    ap.add_argument("--clarified_output", help="Output JSONL for clarified reviews (clarified.py format)")
+    ap.add_argument("--combined_output", help="Output JSONL with both reviews per PR in one record")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--model", default="gemini-1.5-flash", help="Model for both reviews")
+    ap.add_argument("--gate", default=None, help="Gate TSV from gating.py; PRs routed to baseline only get no clarified review")
+    add_run_args(ap)
+    args = ap.parse_args(argv)
+    if not (args.baseline_output or args.clarified_output or args.combined_output):
+        ap.error("give at least one of --baseline_output, --clarified_output, --combined_output")
+
+    model = open_model(args, args.model, "review_runner")
+    qmap = load_questions_tsv(args.questions)
+    amap = load_answers_any(args.answers)
+
+    with contextlib.ExitStack() as stack:
+        writers, written, done = {}, {}, {}
+        for kind, path, ensure_ascii in [("baseline", args.baseline_output, True),
+                                         ("clarified", args.clarified_output, False)]:
+            if path:
+                w, written[kind] = open_output(args, ensure_ascii=ensure_ascii, path=path)
+                writers[kind] = stack.enter_context(w)
+                done[kind] = written[kind]
+        combined, partial = None, {}
+        if args.combined_output:
+            w, _ = open_output(args, ensure_ascii=False, path=args.combined_output)
+            combined = stack.enter_context(w)
+            combined_done, partial = combined_progress(args.combined_output) if args.resume else ({}, {})
+            # a kind is done only if it is in every output that holds it
+            for kind in ("baseline", "clarified"):
+                have = combined_done.get(kind, set())
+                done[kind] = done[kind] & have if kind in done else have
+
+        tasks = plan_tasks(take_shard(iter_jsonl(args.input, args.limit), args.shard_index, args.shard_count), qmap, amap,
+                           done.get("baseline", set()), done.get("clarified", set()) | baseline_only_ids(args.gate))
+        counts = {"baseline": 0, "clarified": 0}
+        current = None
+        for (kind, rec), review in generate_reviews(model, tasks, args):
+            rec[f"{kind}_review"] = review
+            counts[kind] += 1
+            if kind in writers and rec["id"] not in written[kind]:
+                writers[kind].write(rec)
+            if combined is not None:
+                # results for one PR arrive back to back
+                if current is not None and current["id"] != rec["id"]:
+                    combined.write(current)
+                    current = None
+                # a resumed PR keeps the review its earlier, partial combined row already had
+                base = current or partial.pop(rec["id"], {})
+                base.pop(f"{kind}_truncated", None)
+                if rec.pop("truncated", False):
+                    rec[f"{kind}_truncated"] = True
+                current = {**base, **rec}
+        if current is not None:
+            combined.write(current)
+
+    print(f"[RUNNER] baseline={counts['baseline']} clarified={counts['clarified']} reviews written")
+    print_stats("RUNNER", model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from .backends import BACKENDS, get_backend, parse_backend_opts
+from .llm_cache import DEFAULT_CACHE_PATH, CachedModel, ResponseCache
+from .hedging import HedgedModel
+from .io_utils import pr_text_of
+from .metrics import InstrumentedModel, MetricsSink
+from .resilience import Admission, DeadLetter, ResilientModel, is_request_error, payload_record
+from .result_store import update_index
+from .sharding import add_shard_args
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def add_model_args(ap):
+    """
+    Adds the flags of open_model() and the dead letter: backend, rate limits,
+    retries, deadlines and hedging, cache and metrics. For scripts that call
+    the model but write their own output (judge.py, gating.py).
+    """
+    ap.add_argument("--backend", choices=sorted(BACKENDS), default="gemini",
+                    help="Model engine; model names starting with 'fake' always use the stub")
+    ap.add_argument("--backend_opt", action="append", default=[], metavar="KEY=VALUE",
+                    help="Backend option, repeatable (e.g. transport=rest, adapter=jie-jw-wu/clarify-coder)")
+    ap.add_argument("--concurrency", type=int, default=1,
+                    help="Max model requests in flight (1 = sequential); lowered automatically while throttled")
+    ap.add_argument("--rpm", type=float, default=0, help="Requests per minute limit (0 = unlimited)")
+    ap.add_argument("--tpm", type=float, default=0, help="Tokens per minute limit, prompt + output (0 = unlimited)")
+    ap.add_argument("--max_retries", type=int, default=5,
+                    help="Retries for throttled (429), 5xx and timed-out calls, with jittered exponential backoff")
+    ap.add_argument("--retry_base_s", type=float, default=1.0, help="Backoff before the first retry (doubles each time)")
+    ap.add_argument("--retry_max_s", type=float, default=60.0, help="Cap on a single backoff")
+    ap.add_argument("--deadline_s", type=float, default=0,
+                    help="Abandon a model call after this many seconds and retry it as a timeout (0 = no deadline)")
+    ap.add_argument("--hedge", action="store_true",
+                    help="Send a duplicate of any call still running past the observed p95 latency; first answer wins")
+    ap.add_argument("--hedge_budget", type=float, default=0.05,
+                    help="At most this fraction of calls may be hedged")
+    ap.add_argument("--max_abandoned", type=int, default=0,
+                    help="Abandoned calls (past the deadline, or lost hedges) that may still be running before "
+                         "new calls fail fast as timeouts (0 = --concurrency)")
+    ap.add_argument("--dead_letter", default=None,
+                    help="Append requests that still fail after retries to this JSONL (they are skipped, not fatal)")
+    ap.add_argument("--cache_path", default=str(DEFAULT_CACHE_PATH),
+                    help="SQLite file for the response cache")
+    ap.add_argument("--no_cache", action="store_true", help="Always call the model, bypassing the cache")
+    ap.add_argument("--cache_max_mb", type=float, default=1024, help="Evict least recently used entries above this size")
+    ap.add_argument("--cache_max_age_days", type=float, default=30, help="Drop cached responses older than this")
+    ap.add_argument("--metrics_out", default=None,
+                    help="Append per-call metrics (latency, tokens, cache hit, error) to this JSONL")
+
+
+def add_resume_args(ap):
+    """
+    Adds --resume and --fsync_every for scripts that append to their output.
+    """
+    ap.add_argument("--resume", action="store_true",
+                    help="Keep existing --output rows and skip ids already written")
+    ap.add_argument("--fsync_every", type=int, default=50,
+                    help="fsync the output after this many rows (0 = only at the end)")
+
+
+def add_run_args(ap):
+    """
+    Adds the flags shared by the review scripts (baseline.py, clarified.py,
+    review_runner.py): the model flags plus how reviews are generated and written.
+    """
+    add_model_args(ap)
+    ap.add_argument("--max_prompt_tokens", type=int, default=0,
+                    help="Review PRs whose prompt is longer than this in chunks (by file/hunk), then merge (0 = off)")
+    ap.add_argument("--tokenizer", default="approx",
+                    help="Token counting for --max_prompt_tokens: 'approx' (chars/4) or a Hugging Face tokenizer name")
+    ap.add_argument("--stream", action="store_true",
+                    help="Use streamed generation, writing chunks to a live sidecar and recording time to first token")
+    ap.add_argument("--stream_sidecar", default=None,
+                    help="Live JSONL of streamed chunks and per-PR ttft/tokens-per-sec (default: <output>.live.jsonl)")
+    ap.add_argument("--max_output_tokens", type=int, default=0,
+                    help="With --stream, stop a review once this many output tokens have arrived (0 = no cap)")
+    ap.add_argument("--dedup_threshold", type=float, default=0,
+                    help="Review one PR per group of near-duplicates at this MinHash similarity and reuse it (0 = off)")
+    ap.add_argument("--pack", type=int, default=1,
+                    help="Send this many PRs per request as one JSON-structured prompt (1 = off)")
+    add_resume_args(ap)
+    ap.add_argument("--index", action="store_true",
+                    help="Keep a sidecar <output>.idx of byte offsets by id for random access (see result_store.py)")
+    add_shard_args(ap)
+
+
+def open_model(args, model_name: str, script: str):
+    """
+    Returns the configured model for model_name, wrapped according to the run flags.
+    `script` labels the metrics records.
+    """
+    backend = "stub" if model_name.startswith("fake") else args.backend
+    model = get_backend(backend, model_name, **parse_backend_opts(args.backend_opt))
+    if args.deadline_s or args.hedge:
+        # each hedge and abandoned call takes its own rate-limit tokens and concurrency slot
+        model = HedgedModel(model, Admission(args.rpm, args.tpm, args.concurrency), deadline_s=args.deadline_s,
+                            hedge=args.hedge, budget=args.hedge_budget,
+                            max_abandoned=args.max_abandoned or args.concurrency)
+    model = ResilientModel(model, rpm=args.rpm, tpm=args.tpm, max_concurrency=args.concurrency,
+                           max_retries=args.max_retries, base_delay=args.retry_base_s, max_delay=args.retry_max_s)
+    if not args.no_cache:
+        cache = ResponseCache(
+            args.cache_path,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            max_age_days=args.cache_max_age_days,
+        )
+        model = CachedModel(model, backend, model_name, cache)
+    if args.metrics_out:
+        model = InstrumentedModel(model, model_name, script, MetricsSink(args.metrics_out))
+    return model
+
+
+def model_stats(model) -> dict:
+    """
+    Collects stats() from every wrapper layer around the model.
+    """
+    stats = {}
+    while model is not None:
+        if hasattr(model, "stats"):
+            stats.update(model.stats())
+        model = getattr(model, "inner", None)
+    return stats
+
+
+def print_stats(tag: str, model):
+    stats = model_stats(model)
+    if stats:
+        print(f"[{tag}] " + " ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], concurrency: int = 1) -> Iterator[R]:
+    """
+    Lazily applies fn to items with up to `concurrency` calls in flight.
+    Results are yielded in input order, so output files stay deterministic.
+    A few extra items are queued ahead so a slow head-of-line call does not
+    leave workers idle. With concurrency <= 1 this is a plain sequential map.
+    """
+    if concurrency <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = deque()
+        window = 2 * concurrency
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(pool.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+
+
+def output_path(args) -> str:
+    """
+    The script's main output path: --output, or the first of the
+    review_runner outputs that is set.
+    """
+    for name in ("output", "baseline_output", "clarified_output", "combined_output"):
+        path = getattr(args, name, None)
+        if path:
+            return path
+    raise ValueError("no output path in args")
+
+
+def generate_reviews(model, requests: Iterable, args) -> Iterator:
+    """
+    Runs requests (prompt, payload) through the model and yields
+    (payload, review text) in input order, honouring --concurrency, --pack,
+    --max_prompt_tokens and --dedup_threshold. Requests that fail for good go to the dead
+    letter and are not yielded; errors that are not request errors (see
+    resilience.is_request_error) are raised.
+    """
+    dead = DeadLetter(args.dead_letter)
+    budget = args.max_prompt_tokens
+    count = None
+    chunked = []
+    if budget or args.stream:
+        from .token_budget import get_counter, map_reduce_review
+        count = get_counter(args.tokenizer)
+    sidecar, streams = None, []
+    if args.stream:
+        from .streaming import LiveSidecar, stream_review, summarize_streams
+        sidecar = LiveSidecar(args.stream_sidecar or output_path(args) + ".live.jsonl")
+
+    def fits(prompt: str) -> bool:
+        return not budget or count(prompt) <= budget
+
+    def review_text(prompt: str, payload) -> str:
+        if not fits(prompt):
+            rec = payload_record(payload)
+            chunked.append(rec.get("id"))
+            return map_reduce_review(model, prompt, pr_text_of(rec), budget, count, args.concurrency)
+        if sidecar is not None:
+            rec = payload_record(payload)
+            text, stats = stream_review(model, prompt, rec.get("id"), sidecar, count, args.max_output_tokens)
+            streams.append(stats)
+            if stats["truncated"]:
+                rec["truncated"] = True  # cut at --max_output_tokens; --resume redoes it
+            return text
+        return (model.generate_content(prompt).text or "").strip()
+
+    def review_one(req):
+        prompt, payload = req
+        try:
+            return payload, review_text(prompt, payload)
+        except Exception as e:
+            if not is_request_error(e):
+                raise
+            dead.record(payload, e)
+            return payload, None
+
+    def engine(reqs):
+        if args.pack > 1:
+            from .packing import packed_map
+            yield from packed_map(model, reqs, args.pack, args.concurrency, dead, single=review_text, fits=fits)
+            return
+        for payload, review in ordered_map(review_one, reqs, args.concurrency):
+            if review is not None:
+                yield payload, review
+
+    if args.dedup_threshold:
+        from .dedup import DedupIndex, dedup_map
+        index = DedupIndex(args.dedup_threshold)
+        yield from dedup_map(requests, index, engine, lambda prompt, payload: review_one((prompt, payload))[1])
+        print(f"[DEDUP] {index.report()}")
+    else:
+        yield from engine(requests)
+    if chunked:
+        print(f"[BUDGET] {len(chunked)} prompts over {budget} tokens were reviewed in chunks")
+    if sidecar is not None:
+        sidecar.close()
+        if streams:
+            print(f"[STREAM] {summarize_streams(streams)} -> {sidecar.path}")
+    dead.report()
+
+
+def iter_output(path: str) -> Iterator[dict]:
+    """
+    Yields the records of a JSONL output file, skipping lines that are not
+    valid JSON. A torn final line (partial write from a crash) is truncated
+    away so appending can continue from a clean record boundary.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        offset = 0
+        for raw in f:
+            complete = raw.endswith(b"\n")
+            try:
+                obj = json.loads(raw) if raw.strip() else None
+            except ValueError:
+                obj = None
+                if complete:
+                    sys.stderr.write(f"[WARN] Bad JSON at byte {offset} of {path}, will be redone\n")
+            if not complete:
+                sys.stderr.write(f"[WARN] Truncating torn final line at byte {offset} of {path}\n")
+                f.truncate(offset)
+                break
+            if obj is not None:
+                yield obj
+            offset += len(raw)
+
+
+def completed_ids(path: str) -> set:
+    """
+    Returns the ids already written to a JSONL output file (see iter_output).
+    Reviews cut off at --max_output_tokens do not count.
+    """
+    return {str(obj.get("id")) for obj in iter_output(path) if not obj.get("truncated")}
+
+
+class CheckpointWriter:
+    """
+    Appends one JSON record per line. Each record is a single write() of a
+    full line, flushed immediately and fsynced every `fsync_every` records,
+    so a crash loses at most the line being written. With index=True the
+    sidecar id index is brought up to date on close.
+    """
+
+    def __init__(self, path: str, append: bool = False, fsync_every: int = 50, ensure_ascii: bool = True,
+                 index: bool = False):
+        self.path = path
+        self.index = index
+        self.f = open(path, "a" if append else "w", encoding="utf-8")
+        self.fsync_every = fsync_every
+        self.ensure_ascii = ensure_ascii
+        self.count = 0
+
+    def write(self, rec: dict):
+        self.f.write(json.dumps(rec, ensure_ascii=self.ensure_ascii) + "\n")
+        self.f.flush()
+        self.count += 1
+        if self.fsync_every and self.count % self.fsync_every == 0:
+            os.fsync(self.f.fileno())
+
+    def close(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.f.close()
+        if self.index:
+            update_index(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_output(args, ensure_ascii: bool = True, path: str | None = None):
+    """
+    Opens `path` (default args.output) for writing, honouring --resume.
+    Returns (writer, set of ids to skip).
+    """
+    path = path or args.output
+    done = completed_ids(path) if args.resume else set()
+    if done:
+        print(f"[RESUME] {len(done)} ids already in {path}")
+    writer = CheckpointWriter(path, append=args.resume, fsync_every=args.fsync_every, ensure_ascii=ensure_ascii,
+                              index=args.index)
+    return writer, done
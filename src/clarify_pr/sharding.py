@@ -0,0 +1,129 @@
+import argparse
+import csv
+import sys
+import zlib
+from typing import Iterable, Iterator, List
+
+from .io_utils import id_key, iter_jsonl
+from .result_store import JsonlStore
+
+
+def add_shard_args(ap):
+    ap.add_argument("--shard_index", "--shard-index", type=int, default=0,
+                    help="Which shard of the input this process handles (0-based)")
+    ap.add_argument("--shard_count", "--shard-count", type=int, default=1,
+                    help="Split the input into this many shards by a stable hash of id (1 = no sharding)")
+
+
+def shard_of(pid, count: int) -> int:
+    """
+    Shard number for an id; crc32 so every process and host agrees.
+    """
+    return zlib.crc32(str(pid).encode("utf-8")) % count
+
+
+def take_shard(rows: Iterable[dict], index: int, count: int) -> Iterator[dict]:
+    """
+    Keeps only the rows whose id falls in shard `index` of `count`.
+    """
+    if count <= 1:
+        return iter(rows)
+    if not 0 <= index < count:
+        raise SystemExit(f"[error] --shard_index must be in [0, {count}), got {index}")
+    return (row for row in rows if shard_of(row.get("id"), count) == index)
+
+
+# Merge
+
+def _load_tsv(path: str):
+    with open(path, encoding="utf-8", newline="") as f:
+        rdr = csv.reader(f, delimiter="\t")
+        header = next(rdr, [])
+        return header, [dict(zip(header, r)) for r in rdr if r]
+
+
+def merge_tsv(paths: List[str], order: List[str], output: str):
+    """
+    Merges TSV shards (e.g. questions.tsv) with identical headers.
+    Returns (rows written, duplicated ids, ids present).
+    """
+    header, rows, seen = None, {}, {}
+    for path in paths:
+        h, shard_rows = _load_tsv(path)
+        if header is None:
+            header = h
+        elif h != header:
+            raise SystemExit(f"[error] header of {path} differs from {paths[0]}")
+        for row in shard_rows:
+            seen[row["id"]] = seen.get(row["id"], 0) + 1
+            rows[row["id"]] = row  # the later shard wins
+    wrote = 0
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=header or ["id"], delimiter="\t", quoting=csv.QUOTE_MINIMAL)
+        w.writeheader()
+        for pid in order or sorted(rows, key=id_key):
+            if pid in rows:
+                w.writerow(rows[pid])
+                wrote += 1
+    return wrote, {k: n for k, n in seen.items() if n > 1}, set(rows)
+
+
+def merge_jsonl(paths: List[str], order: List[str], output: str):
+    """
+    Merges JSONL shards through their id indexes; only the indexes are held
+    in memory. Lines are copied byte for byte, so the result matches an
+    unsharded run. Returns (rows written, duplicated ids, ids present).
+    """
+    stores = [JsonlStore(p) for p in paths]
+    owner, seen = {}, {}
+    for store in stores:
+        for pid in store.ids():
+            seen[pid] = seen.get(pid, 0) + 1
+            owner[pid] = store  # the later shard wins
+    # duplicates inside one shard (e.g. a redone line after --resume) are not counted; the index keeps the last
+    wrote = 0
+    try:
+        with open(output, "wb") as f:
+            for pid in order or sorted(owner, key=id_key):
+                store = owner.get(pid)
+                if store is not None:
+                    f.write(store.raw(pid) + b"\n")
+                    wrote += 1
+    finally:
+        for store in stores:
+            store.close()
+    return wrote, {k: n for k, n in seen.items() if n > 1}, set(owner)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Merge shard outputs into one canonical results file.")
+    ap.add_argument("shards", nargs="+", help="Shard output files (all JSONL or all TSV)")
+    ap.add_argument("--output", required=True, help="Merged file, e.g. results/baseline.jsonl")
+    ap.add_argument("--reference", default=None,
+                    help="PR JSONL the shards were cut from; gives the output order and the ids expected")
+    ap.add_argument("--limit", type=int, default=None, help="The --limit the shards were run with")
+    ap.add_argument("--strict", action="store_true", help="Exit non-zero on duplicate or missing ids")
+    args = ap.parse_args(argv)
+
+    order = [str(obj.get("id")) for obj in iter_jsonl(args.reference, args.limit)] if args.reference else []
+    if args.shards[0].endswith(".tsv"):
+        wrote, dups, present = merge_tsv(args.shards, order, args.output)
+    else:
+        wrote, dups, present = merge_jsonl(args.shards, order, args.output)
+    missing = [pid for pid in order if pid not in present]
+    extra = sorted(present - set(order), key=id_key) if order else []
+
+    print(f"[MERGE] {len(args.shards)} shards -> {wrote} rows -> {args.output}")
+    if dups:
+        sys.stderr.write(f"[WARN] {len(dups)} ids in more than one shard (last shard kept): "
+                         f"{', '.join(sorted(dups, key=id_key)[:20])}\n")
+    if missing:
+        sys.stderr.write(f"[WARN] {len(missing)} ids from {args.reference} missing: {', '.join(missing[:20])}\n")
+    if extra:
+        sys.stderr.write(f"[WARN] {len(extra)} ids not in {args.reference}, left out: {', '.join(extra[:20])}\n")
+    if args.strict and (dups or missing or extra):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
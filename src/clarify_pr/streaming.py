@@ -0,0 +1,75 @@
+import json
+import threading
+import time
+
+from .metrics import percentile
+
+
+class LiveSidecar:
+    """
+    JSONL file of streaming events, flushed on every write so it can be
+    tailed while a run is going: {"id", "seq", "delta"} per chunk, then one
+    {"id", "done": true, ...} summary per PR.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, rec: dict):
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+
+def stream_review(model, prompt: str, pid, sidecar: LiveSidecar, count, max_output_tokens: int = 0):
+    """
+    Streams one review, copying each chunk to the sidecar. Stops early once
+    about `max_output_tokens` have arrived (0 = no cap), which also frees the
+    request's concurrency slot. Returns (text, per-PR stats).
+    """
+    t0 = time.perf_counter()
+    ttft, parts, tokens, truncated = None, [], 0, False
+    stream = model.generate_stream(prompt)
+    try:
+        for chunk in stream:
+            text = chunk.text or ""
+            if not text:
+                continue
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+            sidecar.write({"id": pid, "seq": len(parts), "delta": text})
+            parts.append(text)
+            tokens += count(text)
+            if max_output_tokens and tokens >= max_output_tokens:
+                truncated = True
+                break
+    finally:
+        stream.close()
+    latency = time.perf_counter() - t0
+    gen_s = latency - (ttft or 0)
+    stats = {
+        "id": pid,
+        "done": True,
+        "ttft_s": None if ttft is None else round(ttft, 4),
+        "latency_s": round(latency, 4),
+        "output_tokens": tokens,
+        "tokens_per_s": round(tokens / gen_s, 1) if gen_s > 0 and tokens else None,
+        "truncated": truncated,
+    }
+    sidecar.write(stats)
+    return "".join(parts).strip(), stats
+
+
+def summarize_streams(stats: list) -> str:
+    ttfts = [s["ttft_s"] for s in stats if s["ttft_s"] is not None]
+    rates = [s["tokens_per_s"] for s in stats if s["tokens_per_s"] is not None]
+    truncated = sum(s["truncated"] for s in stats)
+    return (f"streams={len(stats)} ttft_p50_s={percentile(ttfts, 50):.3f} ttft_p95_s={percentile(ttfts, 95):.3f} "
+            f"tokens_per_s_p50={percentile(rates, 50):.1f} truncated={truncated}")
@@ -0,0 +1,222 @@
+import argparse
+import csv
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .result_store import ParquetStore, is_parquet
+
+if TYPE_CHECKING:
+    import numpy as np  # imported where it is used, so --help starts fast
+
+BASE = Path(__file__).resolve().parents[2]
+DEFAULT_INPUT = BASE / "results" / "eval_scored.tsv"
+DEFAULT_OUTPUT = BASE / "results" / "eval_summary.tsv"
+
+BASELINE_SUFFIX = "_baseline"
+CLARIFIED_SUFFIX = "_clarified"
+
+# cap on bootstrap indices materialised at once (resamples x rows)
+BOOTSTRAP_CHUNK_ELEMS = 20_000_000
+
+
+def to_num(val, cast=float):
+    if val is None: return math.nan
+    s = str(val).strip()
+    if s == "": return math.nan
+    if s.endswith("%"):
+        try:
+            return cast(s[:-1])
+        except Exception:
+            return math.nan
+    try:
+        return cast(s)
+    except Exception:
+        return math.nan
+
+
+def to_num_array(cells) -> "np.ndarray":
+    """
+    Converts a column of TSV strings to float64 ("" and junk -> nan, "12%" -> 12).
+    """
+    import numpy as np
+    cleaned = [c.strip().rstrip("%") or "nan" for c in cells]
+    try:
+        return np.asarray(cleaned, dtype=np.float64)
+    except ValueError:
+        return np.fromiter((to_num(c) for c in cells), dtype=np.float64, count=len(cells))
+
+
+def read_columns(path: Path):
+    """
+    Reads a TSV into (header, {column: list of str}, row count). With
+    duplicated header names the last column wins, as with csv.DictReader.
+    """
+    with path.open(encoding="utf-8", newline="") as f:
+        rdr = csv.reader(f, delimiter="\t")
+        header = next(rdr, [])
+        rows = [r for r in rdr if r]
+    last_index = {name: i for i, name in enumerate(header)}
+    cols = {name: [r[i] if i < len(r) else "" for r in rows] for name, i in last_index.items()}
+    return header, cols, len(rows)
+
+
+def read_parquet_columns(path: Path, group_by: list):
+    """
+    Same shape as read_columns, but reads only the metric and group-by columns.
+    """
+    with ParquetStore(str(path)) as store:
+        header = store.columns
+        wanted = [m + sfx for m in metric_pairs(header) for sfx in (BASELINE_SUFFIX, CLARIFIED_SUFFIX)]
+        data = store.read_columns(list(dict.fromkeys(wanted + [g for g in group_by if g in header])))
+        n_rows = len(store)
+    cols = {name: ["" if v is None else str(v) for v in vals] for name, vals in data.items()}
+    return header, cols, n_rows
+
+
+def metric_pairs(header) -> list:
+    """
+    Metric names that have both a `<metric>_baseline` and a `<metric>_clarified` column, in header order.
+    """
+    names = set(header)
+    metrics = []
+    for h in header:
+        if h.endswith(BASELINE_SUFFIX):
+            m = h[: -len(BASELINE_SUFFIX)]
+            if m + CLARIFIED_SUFFIX in names and m not in metrics:
+                metrics.append(m)
+    return metrics
+
+
+def bootstrap_mean_ci(d: "np.ndarray", n_boot: int, ci: float, rng: "np.random.Generator"):
+    """
+    Percentile bootstrap CI for mean(d).
+    Scores take few distinct values, so a resample is drawn as multinomial
+    counts over the unique values (same distribution as resampling rows,
+    at O(unique) per resample). Otherwise rows are resampled in chunks to
+    bound memory.
+    """
+    import numpy as np
+    n = len(d)
+    if n == 0 or n_boot <= 0:
+        return math.nan, math.nan
+    values, counts = np.unique(d, return_counts=True)
+    if len(values) <= n // 4:
+        means = rng.multinomial(n, counts / n, size=n_boot) @ values / n
+    else:
+        chunk = max(1, min(n_boot, BOOTSTRAP_CHUNK_ELEMS // n))
+        means = np.empty(n_boot)
+        for start in range(0, n_boot, chunk):
+            stop = min(n_boot, start + chunk)
+            idx = rng.integers(0, n, size=(stop - start, n))
+            means[start:stop] = d[idx].mean(axis=1)
+    alpha = (1 - ci) / 2
+    lo, hi = np.quantile(means, [alpha, 1 - alpha])
+    return float(lo), float(hi)
+
+
+def nanmean(x: "np.ndarray") -> float:
+    import numpy as np
+    x = x[~np.isnan(x)]
+    return float(x.mean()) if x.size else math.nan
+
+
+def summarize_group(data: dict, metrics: list, n_boot: int, ci: float, rng) -> dict:
+    """
+    data maps column -> float array for one group.
+    Returns means, the delta of means, and a bootstrap CI and paired
+    effect size (Cohen's d_z) for each metric.
+    """
+    import numpy as np
+    n = len(next(iter(data.values()))) if data else 0
+    means, deltas, extras = {}, {}, {}
+    for m in metrics:
+        b, c = data[m + BASELINE_SUFFIX], data[m + CLARIFIED_SUFFIX]
+        mb, mc = nanmean(b), nanmean(c)
+        means[f"{m}_baseline_mean"] = mb
+        means[f"{m}_clarified_mean"] = mc
+        deltas[f"delta_{m}"] = mc - mb
+
+        d = c - b
+        d = d[~np.isnan(d)]
+        lo, hi = bootstrap_mean_ci(d, n_boot, ci, rng)
+        sd = float(d.std(ddof=1)) if d.size > 1 else math.nan
+        extras[f"delta_{m}_ci_low"] = lo
+        extras[f"delta_{m}_ci_high"] = hi
+        extras[f"effect_size_{m}"] = float(d.mean()) / sd if sd and not math.isnan(sd) else math.nan
+        extras[f"n_paired_{m}"] = int(d.size)
+    return {"n_samples": n, **means, **deltas, **extras}
+
+
+def summarize(path: Path, group_by: list, n_boot: int = 1000, ci: float = 0.95, seed: int = 0) -> list:
+    import numpy as np
+    header, cols, n_rows = read_parquet_columns(path, group_by) if is_parquet(path) else read_columns(path)
+    missing = [g for g in group_by if g not in cols]
+    if missing:
+        raise SystemExit(f"[error] --group-by column(s) not in {path}: {', '.join(missing)}")
+    metrics = metric_pairs(header)
+    numeric = {name: to_num_array(cols[name]) for m in metrics for name in (m + BASELINE_SUFFIX, m + CLARIFIED_SUFFIX)}
+    rng = np.random.default_rng(seed)
+
+    if not group_by:
+        return [summarize_group(numeric, metrics, n_boot, ci, rng)]
+
+    keys = list(zip(*(cols[g] for g in group_by))) if n_rows else []
+    uniq, inverse = np.unique(np.array(["\x1f".join(k) for k in keys], dtype=object), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(uniq)))[:-1]
+    rows = []
+    for key, idx in zip(uniq, np.split(order, bounds)):
+        row = dict(zip(group_by, key.split("\x1f")))
+        row.update(summarize_group({k: v[idx] for k, v in numeric.items()}, metrics, n_boot, ci, rng))
+        rows.append(row)
+    return rows
+
+
+def fmt(v, digits=2):
+    return "nan" if isinstance(v, float) and math.isnan(v) else f"{v:.{digits}f}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarize eval_scored.tsv into dataset-level metrics.")
+    ap.add_argument("--input", default=DEFAULT_INPUT, help="Path to eval_scored.tsv (or .parquet)")
+    ap.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the summary TSV")
+    ap.add_argument("--print", action="store_true", help="Print summary to stdout")
+    ap.add_argument("--group-by", default="", help="Comma-separated columns; one summary row per group")
+    ap.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap resamples for delta CIs (0 = off)")
+    ap.add_argument("--ci", type=float, default=0.95, help="Confidence level for the bootstrap interval")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    src = Path(args.input)
+    if not src.exists():
+        raise SystemExit(f"[error] file not found: {src}")
+
+    group_by = [g for g in args.group_by.split(",") if g]
+    rows = summarize(src, group_by, args.bootstrap, args.ci, args.seed)
+    if not rows:
+        raise SystemExit(f"[error] no rows in {src}")
+
+    outp = Path(args.output)
+    outp.parent.mkdir(parents=True, exist_ok=True)
+    with outp.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0].keys()), delimiter="\t")
+        w.writeheader()
+        for row in rows:
+            w.writerow({k: ("" if isinstance(v, float) and math.isnan(v) else v) for k, v in row.items()})
+
+    if args.print:
+        metrics = [k[len("delta_"):] for k in rows[0] if k.startswith("delta_") and not k.endswith(("_ci_low", "_ci_high"))]
+        for row in rows:
+            label = " ".join(f"{g}={row[g]}" for g in group_by)
+            print(f"n_samples\t{row['n_samples']}" + (f"\t{label}" if label else ""))
+            for m in metrics:
+                print(f"{m} (base/clar)\t{fmt(row[f'{m}_baseline_mean'])}\t{fmt(row[f'{m}_clarified_mean'])}"
+                      f"\tΔ={fmt(row[f'delta_{m}'])}"
+                      f"\t{int(args.ci * 100)}% CI [{fmt(row[f'delta_{m}_ci_low'])}, {fmt(row[f'delta_{m}_ci_high'])}]"
+                      f"\td_z={fmt(row[f'effect_size_{m}'])}")
+        print(f"\nWrote summary -> {outp}")
+
+
+if __name__ == "__main__":
+    main()
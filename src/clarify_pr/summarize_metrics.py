@@ -0,0 +1,87 @@
+import argparse
+import csv
+import sys
+from collections import defaultdict
+
+from .io_utils import iter_jsonl
+from .metrics import percentile
+
+# USD per 1M tokens (input, output); override with --price model=in,out
+PRICES = {
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+}
+
+FIELDS = [
+    "script", "model", "calls", "errors", "cache_hits", "wall_s", "calls_per_s",
+    "p50_ms", "p95_ms", "p99_ms", "ttft_p50_ms", "ttft_p95_ms", "stopped_early", "input_tokens", "output_tokens", "tokens_per_s", "est_cost_usd",
+]
+
+
+def summarize(paths, prices) -> list:
+    groups = defaultdict(list)
+    for path in paths:
+        for rec in iter_jsonl(path):
+            groups[(rec.get("script", ""), rec.get("model", ""))].append(rec)
+
+    rows = []
+    for (script, model), recs in sorted(groups.items()):
+        start = min(r["ts"] for r in recs)
+        end = max(r["ts"] + r["latency_s"] for r in recs)
+        wall = max(end - start, 1e-9)
+        # latency percentiles describe real requests, not cache hits
+        lat = [r["latency_s"] * 1000 for r in recs if not r.get("cache_hit")]
+        # streamed calls only (--stream)
+        ttft = [r["ttft_s"] * 1000 for r in recs if r.get("ttft_s") is not None and not r.get("cache_hit")]
+        tin = sum(r.get("input_tokens") or 0 for r in recs)
+        tout = sum(r.get("output_tokens") or 0 for r in recs)
+        price = prices.get(model)
+        rows.append({
+            "script": script,
+            "model": model,
+            "calls": len(recs),
+            "errors": sum(1 for r in recs if r.get("error")),
+            "cache_hits": sum(1 for r in recs if r.get("cache_hit")),
+            "wall_s": round(wall, 3),
+            "calls_per_s": round(len(recs) / wall, 3),
+            "p50_ms": round(percentile(lat, 50), 1),
+            "p95_ms": round(percentile(lat, 95), 1),
+            "p99_ms": round(percentile(lat, 99), 1),
+            "ttft_p50_ms": round(percentile(ttft, 50), 1) if ttft else "",
+            "ttft_p95_ms": round(percentile(ttft, 95), 1) if ttft else "",
+            "stopped_early": sum(1 for r in recs if r.get("stopped_early")),
+            "input_tokens": tin,
+            "output_tokens": tout,
+            "tokens_per_s": round((tin + tout) / wall, 1),
+            "est_cost_usd": round((tin * price[0] + tout * price[1]) / 1e6, 4) if price else "",
+        })
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarize per-call metrics JSONL written with --metrics_out.")
+    ap.add_argument("inputs", nargs="+", help="One or more metrics JSONL files")
+    ap.add_argument("--output", help="Write the summary TSV here instead of stdout")
+    ap.add_argument("--price", action="append", default=[],
+                    help="Override pricing as model=input_usd_per_1M,output_usd_per_1M")
+    args = ap.parse_args(argv)
+
+    prices = dict(PRICES)
+    for spec in args.price:
+        model, _, pair = spec.rpartition("=")
+        pin, pout = (float(x) for x in pair.split(","))
+        prices[model] = (pin, pout)
+
+    rows = summarize(args.inputs, prices)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        w = csv.DictWriter(out, fieldnames=FIELDS, delimiter="\t", lineterminator="\n")
+        w.writeheader()
+        w.writerows(rows)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
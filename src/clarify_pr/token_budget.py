@@ -0,0 +1,155 @@
+import re
+from functools import lru_cache
+from typing import Callable, List
+
+from .resilience import RequestError
+from .run_utils import ordered_map
+
+CHARS_PER_TOKEN = 4  # rough English/code average for the "approx" tokenizer
+
+REDUCE_PROMPT = """You are a senior code reviewer.
+The review comments below were written separately for {n} parts of one large PR.
+Merge them into a single concise review: drop duplicates, keep the most specific
+points and any file or line references, and keep the same style (bullets are fine).
+
+{parts}
+"""
+
+PART_NOTE = "[Part {i} of {n} of a large PR; review only this part]\n"
+
+FILE_SPLIT = re.compile(r"(?m)^(?=diff --git )")
+HUNK_SPLIT = re.compile(r"(?m)^(?=@@ )")
+
+
+@lru_cache(maxsize=None)
+def _hf_tokenizer(name: str):
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(name, use_fast=True)
+
+
+def get_counter(tokenizer: str = "approx") -> Callable[[str], int]:
+    """
+    Returns a text -> token count function. "approx" is chars / 4 and needs
+    nothing; any other value is loaded (once per process) as a Hugging Face
+    tokenizer name. Counts of repeated texts are memoised.
+    """
+    if tokenizer == "approx":
+        return lambda text: -(-len(text) // CHARS_PER_TOKEN)
+    tok = _hf_tokenizer(tokenizer)
+
+    @lru_cache(maxsize=4096)
+    def count(text: str) -> int:
+        return len(tok(text, add_special_tokens=False)["input_ids"])
+    return count
+
+
+def _split_lines(text: str, budget: int, count) -> List[str]:
+    pieces, cur = [], ""
+    for line in text.splitlines(keepends=True):
+        while count(line) > budget:  # one huge line: cut it by characters
+            if cur:
+                pieces.append(cur)
+                cur = ""
+            cut = max(1, len(line) * budget // count(line))
+            pieces.append(line[:cut])
+            line = line[cut:]
+        if cur and count(cur + line) > budget:
+            pieces.append(cur)
+            cur = ""
+        cur += line
+    if cur:
+        pieces.append(cur)
+    return pieces
+
+
+def split_pr(text: str, budget: int, count) -> List[str]:
+    """
+    Splits PR text into chunks of at most `budget` tokens, cutting at file
+    boundaries (`diff --git`), then hunks (`@@`, under their file header),
+    then lines. Small neighbouring pieces are packed back together. The preamble before the
+    first diff (title, description) is repeated at the top of every chunk
+    when it takes at most a quarter of the budget.
+    """
+    files = [f for f in FILE_SPLIT.split(text) if f]
+    preamble = ""
+    if files and not files[0].startswith("diff --git ") and len(files) > 1 and count(files[0]) <= budget // 4:
+        preamble = files.pop(0)
+    room = budget - count(preamble)
+
+    pieces = []
+    for f in files:
+        if count(f) <= room:
+            pieces.append(f)
+            continue
+        # each hunk keeps the file's diff header so the reviewer knows where it is
+        header, *hunks = HUNK_SPLIT.split(f)
+        if not hunks or count(header) > room // 4:
+            header, hunks = "", [h for h in (header, *hunks) if h]
+        for hunk in hunks:
+            body = room - count(header)
+            pieces.extend(header + h for h in ([hunk] if count(hunk) <= body else _split_lines(hunk, body, count)))
+
+    chunks, cur = [], ""
+    for piece in pieces:
+        if cur and count(cur + piece) > room:
+            chunks.append(cur)
+            cur = ""
+        cur += piece
+    if cur:
+        chunks.append(cur)
+    return [preamble + c for c in chunks]
+
+
+def map_reduce_review(model, prompt: str, pr_text: str, budget: int, count, concurrency: int = 1) -> str:
+    """
+    Reviews an oversized prompt in parts: the PR text inside `prompt` is
+    split into chunks that fit `budget` along with the rest of the prompt,
+    each chunk is reviewed in parallel, and the partial reviews are merged
+    by reduce passes (themselves grouped to fit the budget). If the PR text
+    is not found verbatim in the prompt, the whole prompt is chunked.
+    """
+    if pr_text and pr_text in prompt:
+        head, _, tail = prompt.partition(pr_text)
+    else:
+        head, pr_text, tail = "", prompt, ""
+    overhead = count(head) + count(tail) + count(PART_NOTE.format(i=999, n=999))
+    chunks = split_pr(pr_text, max(1, budget - overhead), count)
+    n = len(chunks)
+    if not n:
+        raise RequestError("nothing to review: empty PR text")
+
+    def review_part(item):
+        i, chunk = item
+        resp = model.generate_content(head + PART_NOTE.format(i=i, n=n) + chunk + tail)
+        return (resp.text or "").strip()
+
+    partials = list(ordered_map(review_part, enumerate(chunks, start=1), concurrency))
+    return reduce_reviews(model, partials, budget, count, concurrency)
+
+
+def reduce_reviews(model, partials: List[str], budget: int, count, concurrency: int = 1) -> str:
+    if not partials:
+        raise RequestError("no partial reviews to reduce")
+    if len(partials) == 1:
+        return partials[0]
+    overhead = count(REDUCE_PROMPT.format(n=len(partials), parts=""))
+    groups, cur = [], []
+    for p in partials:
+        block = f"### Part {len(cur) + 1}\n{p}\n\n"
+        if cur and count("".join(cur) + block) + overhead > budget:
+            groups.append(cur)
+            cur, block = [], f"### Part 1\n{p}\n\n"
+        cur.append(block)
+    groups.append(cur)
+
+    def reduce_group(blocks):
+        if len(blocks) == 1:
+            return blocks[0].split("\n", 1)[1].strip()
+        resp = model.generate_content(REDUCE_PROMPT.format(n=len(blocks), parts="".join(blocks).strip()))
+        return (resp.text or "").strip()
+
+    merged = list(ordered_map(reduce_group, groups, concurrency))
+    if len(merged) == len(partials):
+        # every partial fills a reduce prompt alone; nothing more can be merged
+        return "\n\n".join(merged)
+    return reduce_reviews(model, merged, budget, count, concurrency)
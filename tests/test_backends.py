@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+
+from clarify_pr.backends import Backend, TextResponse
+
+
+class EchoBackend(Backend):
+    """
+    Answers with the prompt and the kwargs it was called with.
+    """
+
+    def __init__(self, model_name="echo", **opts):
+        super().__init__(model_name, **opts)
+        self.threads = set()
+
+    def generate(self, prompt, **kwargs):
+        self.threads.add(threading.get_ident())
+        return TextResponse(f"{prompt}|{sorted(kwargs)}")
+
+
+def test_backend_requires_generate():
+    class NoGenerate(Backend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoGenerate("x")
+
+
+def test_generate_many_keeps_order_and_kwargs():
+    backend = EchoBackend()
+    prompts = [f"p{i}" for i in range(20)]
+    out = backend.generate_many(prompts, concurrency=4, generation_config={"temperature": 0})
+    assert [r.text for r in out] == [f"p{i}|['generation_config']" for i in range(20)]
+
+
+def test_generate_many_runs_on_one_thread_per_worker():
+    backend = EchoBackend()
+    backend.generate_many(["a", "b", "c"], concurrency=1)
+    assert len(backend.threads) == 1
+
+
+def test_agenerate_defaults_to_generate():
+    backend = EchoBackend()
+    resp = asyncio.run(backend.agenerate("p", stream=False))
+    assert resp.text == "p|['stream']"
@@ -0,0 +1,17 @@
+from clarify_pr.clarified import build_review_request
+
+
+def test_review_request_skips_prs_without_id_or_text():
+    assert build_review_request({"prompt": "Fix the cache"}, {}, {}) is None
+    assert build_review_request({"id": None, "prompt": "Fix the cache"}, {}, {}) is None
+    assert build_review_request({"id": "", "prompt": "Fix the cache"}, {}, {}) is None
+    assert build_review_request({"id": 3, "prompt": ""}, {}, {}) is None
+
+
+def test_review_request_keeps_falsy_ids_and_joins_qa_by_string_id():
+    qmap = {"0": {"pr_title": "Cache fix", "questions": ["Which cache?"]}}
+    amap = {"0": ["The response cache"]}
+    prompt, rec = build_review_request({"id": 0, "prompt": "Fix the cache"}, qmap, amap)
+    assert rec["id"] == "0"
+    assert rec["questions"] == ["Q1: Which cache?"] and rec["answers"] == ["A1: The response cache"]
+    assert "Cache fix" in prompt and "The response cache" in prompt
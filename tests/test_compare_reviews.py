@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from clarify_pr import compare_reviews
+from clarify_pr.compare_reviews import JOINS, load_latest
+
+
+def write_jsonl(path, lines):
+    path.write_text("".join(line if isinstance(line, str) else json.dumps(line) + "\n" for line in lines),
+                    encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def resumed(tmp_path):
+    """
+    A baseline and a clarified file as --resume leaves them: a corrupt line,
+    and redone records appended after the ones they replace.
+    """
+    baseline = write_jsonl(tmp_path / "baseline.jsonl", [
+        *({"id": i, "prompt": f"p{i}", "baseline_review": f"b{i}"} for i in range(1, 5)),
+        {"id": 3, "prompt": "p3", "baseline_review": "b3-redo"},
+    ])
+    clarified = write_jsonl(tmp_path / "clarified.jsonl", [
+        {"id": 1, "clarified_review": "c1"},
+        '{"id": 2, "clarified_re\n',
+        {"id": 3, "clarified_review": "c3"},
+        {"id": 4, "clarified_review": "c4"},
+        {"id": 2, "clarified_review": "c2-redo"},
+    ])
+    return tmp_path, baseline, clarified
+
+
+@pytest.mark.parametrize("join", ["index", "hash", "lookup"])
+def test_joins_keep_the_last_record_of_each_id(resumed, join):
+    _, baseline, clarified = resumed
+    pairs = {left["id"]: (left["baseline_review"], right["clarified_review"])
+             for left, right in JOINS[join](baseline, clarified)}
+    assert len(list(JOINS[join](baseline, clarified))) == 4
+    assert pairs == {"1": ("b1", "c1"), "2": ("b2", "c2-redo"), "3": ("b3-redo", "c3"), "4": ("b4", "c4")}
+
+
+def test_index_join_writes_nothing_next_to_its_inputs(resumed):
+    tmp_path, baseline, clarified = resumed
+    list(JOINS["index"](baseline, clarified))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["baseline.jsonl", "clarified.jsonl"]
+
+
+def test_load_latest_keeps_file_order_of_last_records(resumed):
+    _, baseline, _ = resumed
+    assert [r["baseline_review"] for r in load_latest(baseline, ["id", "baseline_review"])] == ["b1", "b2", "b4", "b3-redo"]
+
+
+def test_merge_join_skips_adjacent_duplicates_and_rejects_others(tmp_path):
+    baseline = write_jsonl(tmp_path / "b.jsonl", [{"id": i, "prompt": "", "baseline_review": f"b{i}"} for i in (1, 2, 3)])
+    clarified = write_jsonl(tmp_path / "c.jsonl", [{"id": 1, "clarified_review": "old"}, {"id": 1, "clarified_review": "c1"},
+                                                   {"id": 3, "clarified_review": "c3"}])
+    assert [(l["id"], r["clarified_review"]) for l, r in JOINS["merge"](baseline, clarified)] == [("1", "c1"), ("3", "c3")]
+
+    write_jsonl(tmp_path / "c.jsonl", [{"id": 1, "clarified_review": "c1"}, {"id": 3, "clarified_review": "c3"},
+                                       {"id": 1, "clarified_review": "c1-redo"}])
+    with pytest.raises(ValueError, match="not sorted by id with one record per id"):
+        list(JOINS["merge"](baseline, clarified))
+
+
+def test_parquet_inputs_are_read_by_column(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from clarify_pr.result_store import ParquetStore, to_parquet
+
+    src = write_jsonl(tmp_path / "c.jsonl", [{"id": 1, "clarified_review": "old", "extra": "x"},
+                                             {"id": 2, "clarified_review": "c2", "extra": "x"},
+                                             {"id": 1, "clarified_review": "c1", "extra": "x"}])
+    dst = str(tmp_path / "c.parquet")
+    to_parquet(src, dst)
+    monkeypatch.setattr(ParquetStore, "get", lambda *a, **k: pytest.fail("row-by-row read"))
+    assert list(load_latest(dst, ["id", "clarified_review"])) == [{"id": "2", "clarified_review": "c2"},
+                                                                  {"id": "1", "clarified_review": "c1"}]
+
+
+def test_main_writes_one_row_per_id(resumed):
+    tmp_path, baseline, clarified = resumed
+    out = tmp_path / "comparison.tsv"
+    compare_reviews.main(["--baseline", baseline, "--clarified", clarified, "--output", str(out)])
+    rows = out.read_text(encoding="utf-8").splitlines()
+    assert rows[0].split("\t") == compare_reviews.OUTPUT_COLS
+    assert len(rows) == 5
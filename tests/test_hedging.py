@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from clarify_pr.backends import TextResponse
+from clarify_pr.hedging import HedgedModel
+from clarify_pr.resilience import Admission, ResilientModel
+
+
+class SlowModel:
+    """
+    Answers after `delays[i]` seconds on its i-th call (the last delay repeats).
+    """
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.kwargs = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        with self._lock:
+            i = self.calls
+            self.calls += 1
+            self.kwargs.append(kwargs)
+        time.sleep(self.delays[min(i, len(self.delays) - 1)])
+        return TextResponse(f"{prompt}#{i}")
+
+
+def test_hedge_without_deadline_passes_kwargs():
+    inner = SlowModel([0])
+    model = HedgedModel(inner, Admission(max_concurrency=4), hedge=True)
+    assert model.generate_content("p", generation_config={"temperature": 0}).text == "p#0"
+    assert inner.kwargs == [{"generation_config": {"temperature": 0}}]
+
+
+def test_hedge_without_deadline_through_resilient_model():
+    inner = SlowModel([0.001] * 3 + [0.3] + [0.001])
+    model = ResilientModel(HedgedModel(inner, Admission(max_concurrency=4), hedge=True, budget=1.0, min_samples=3))
+    texts = [model.generate_content(f"p{i}").text for i in range(4)]
+    assert texts[:3] == ["p0#0", "p1#1", "p2#2"]
+    # the fourth call straggles and its hedge (call #4) answers first
+    assert texts[3] == "p3#4"
+    stats = model.inner.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+def test_deadline_abandons_call_but_keeps_its_slot():
+    admission = Admission(max_concurrency=2)
+    model = HedgedModel(SlowModel([0.3, 0]), admission, deadline_s=0.05, max_abandoned=2)
+    with pytest.raises(TimeoutError):
+        model.generate_content("slow")
+    assert model.abandoned == 1
+    assert admission.limiter.inflight == 1
+    # the next call still gets the second slot
+    assert model.generate_content("fast").text == "fast#1"
+    time.sleep(0.4)
+    assert model.abandoned == 0
+    assert admission.limiter.inflight == 0
+
+
+def test_new_calls_time_out_while_too_many_calls_are_abandoned():
+    model = HedgedModel(SlowModel([0.5]), Admission(max_concurrency=4), deadline_s=0.05, max_abandoned=1)
+    with pytest.raises(TimeoutError):
+        model.generate_content("a")
+    with pytest.raises(TimeoutError, match="abandoned"):
+        model.generate_content("b")
+    assert model.timeouts == 2
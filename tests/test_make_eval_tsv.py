@@ -0,0 +1,21 @@
+from clarify_pr.make_eval_tsv import read_ans
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_tall_answers_keep_the_last_row_of_each_id(tmp_path):
+    path = write(tmp_path / "a.tsv", "id\tanswer\n1\tfirst\n2\tonly\n1\tsecond\n")
+    assert read_ans(path) == {1: "second", 2: "only"}
+
+
+def test_headerless_tall_answers_keep_the_last_row(tmp_path):
+    path = write(tmp_path / "a.tsv", "1\tfirst\n1\tlast\n")
+    assert read_ans(path) == {1: "last"}
+
+
+def test_wide_answers_are_joined_on_one_line(tmp_path):
+    path = write(tmp_path / "a.tsv", 'id\tanswers\n1\t"A1: Staging only\nA2: No mobile impact"\n')
+    assert read_ans(path) == {1: "Staging only No mobile impact"}
@@ -0,0 +1,119 @@
+import json
+import threading
+
+import pytest
+
+from clarify_pr.backends import TextResponse
+from clarify_pr.llm_cache import CachedModel, ResponseCache
+from clarify_pr.packing import PACKED_CONFIG, _packs, packed_map, parse_packed
+from clarify_pr.resilience import DeadLetter, RequestError
+
+
+class PackModel:
+    """
+    Answers packed prompts with `packed(n)` (a JSON array of reviews by
+    default) and single prompts with "single:<prompt>". Records every call.
+    """
+
+    def __init__(self, packed=None, fail_single=()):
+        self.packed = packed or (lambda n: json.dumps([{"task": i, "review": f"r{i}"} for i in range(1, n + 1)]))
+        self.fail_single = set(fail_single)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        with self._lock:
+            self.calls.append((prompt, kwargs))
+        if kwargs.get("generation_config") == PACKED_CONFIG:
+            text = self.packed(prompt.count("\n### Task "))
+            if isinstance(text, Exception):
+                raise text
+            return TextResponse(text)
+        if prompt in self.fail_single:
+            raise RequestError(f"rejected {prompt}")
+        return TextResponse(f"single:{prompt}")
+
+
+def single_calls(model):
+    return [p for p, kw in model.calls if not kw]
+
+
+def test_parse_packed_reads_fenced_arrays_and_skips_bad_entries():
+    text = '```json\n[{"task": 1, "review": " a "}, {"task": "2", "review": "b"}, ' \
+           '{"task": 3, "review": ""}, {"task": 9, "review": "x"}, "junk", {"review": "no task"}]\n```'
+    assert parse_packed(text, 3) == {1: "a", 2: "b"}
+
+
+def test_parse_packed_accepts_wrapped_object_and_rejects_prose():
+    assert parse_packed('{"reviews": [{"task": 1, "review": "a"}]}', 1) == {1: "a"}
+    assert parse_packed("Sure! Here are the reviews.", 2) == {}
+    assert parse_packed(None, 2) == {}
+
+
+def test_packs_respect_k_and_fits():
+    reqs = [(f"p{i}", i) for i in range(7)]
+    assert [[i for _, i in pack] for pack in _packs(reqs, 3, lambda p: True)] == [[0, 1, 2], [3, 4, 5], [6]]
+    # a packed prompt of more than two tasks never fits
+    fits = lambda prompt: prompt.count("\n### Task ") <= 2  # noqa: E731
+    assert [len(pack) for pack in _packs(reqs, 3, fits)] == [2, 2, 2, 1]
+
+
+def test_packed_map_keeps_order_and_uses_one_call_per_pack():
+    model = PackModel()
+    reqs = [(f"p{i}", i) for i in range(5)]
+    out = list(packed_map(model, reqs, 2, concurrency=3))
+    assert out == [(0, "r1"), (1, "r2"), (2, "r1"), (3, "r2"), (4, "single:p4")]
+    assert len(model.calls) == 3
+
+
+def test_packed_map_falls_back_for_missing_tasks():
+    model = PackModel(packed=lambda n: json.dumps([{"task": 2, "review": "r2"}]))
+    out = list(packed_map(model, [("p0", 0), ("p1", 1), ("p2", 2)], 3))
+    assert out == [(0, "single:p0"), (1, "r2"), (2, "single:p2")]
+    assert single_calls(model) == ["p0", "p2"]
+
+
+def test_packed_map_falls_back_when_the_packed_call_fails(capsys):
+    model = PackModel(packed=lambda n: RequestError("503 unavailable"), fail_single={"p1"})
+    dead = DeadLetter(None)
+    out = list(packed_map(model, [("p0", {"id": 0}), ("p1", {"id": 1})], 2, dead=dead))
+    assert out == [({"id": 0}, "single:p0")]
+    assert dead.count == 1
+    assert "packed_failures=1" in capsys.readouterr().out
+
+
+def test_packed_map_raises_errors_that_are_not_request_errors():
+    model = PackModel(packed=lambda n: KeyError("bug"))
+    with pytest.raises(KeyError):
+        list(packed_map(model, [("p0", 0), ("p1", 1)], 2))
+
+
+def test_unparsable_packed_response_is_not_cached(tmp_path):
+    inner = PackModel(packed=lambda n: "not json")
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    model = CachedModel(inner, "stub", "fake", cache)
+    reqs = [("p0", 0), ("p1", 1)]
+    assert list(packed_map(model, reqs, 2)) == [(0, "single:p0"), (1, "single:p1")]
+    inner.packed = lambda n: json.dumps([{"task": i, "review": f"r{i}"} for i in range(1, n + 1)])
+    assert list(packed_map(model, reqs, 2)) == [(0, "r1"), (1, "r2")]
+    # the good answer is cached now
+    calls = len(inner.calls)
+    assert list(packed_map(model, reqs, 2)) == [(0, "r1"), (1, "r2")]
+    assert len(inner.calls) == calls
+
+
+def test_cache_hits_batch_access_time_updates(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    cache.touch_batch = 3
+    cache.put("k", "m", "text")
+
+    def accessed():
+        return cache._db.execute("SELECT accessed FROM responses WHERE key = 'k'").fetchone()[0]
+
+    before = accessed()
+    assert cache.get("k") == "text"
+    assert cache.get("k") == "text"
+    assert accessed() == before
+    cache.flush()
+    assert accessed() > before
+    cache.close()
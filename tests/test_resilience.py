@@ -0,0 +1,174 @@
+import argparse
+import json
+import threading
+import time
+
+import pytest
+
+from clarify_pr.backends import TextResponse
+from clarify_pr.resilience import (Admission, DeadLetter, RequestError, ResilientModel, classify_error,
+                                   is_request_error)
+from clarify_pr.run_utils import add_run_args, generate_reviews
+
+
+class APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class BlockedPromptException(Exception):
+    pass
+
+
+class FlakyModel:
+    """
+    Raises the given errors in turn, then answers.
+    """
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return TextResponse(f"ok:{prompt}")
+
+
+@pytest.mark.parametrize("error, kind", [
+    (APIError(429), "throttle"),
+    (APIError("503"), "transient"),
+    (ResourceExhausted(), "throttle"),
+    (TimeoutError(), "transient"),
+    (ConnectionResetError(), "transient"),
+    (APIError(400), "fatal"),
+    (ValueError("bug"), "fatal"),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+@pytest.mark.parametrize("error, expected", [
+    (RequestError("empty PR"), True),
+    (APIError(429), True),
+    (APIError(400), True),
+    (BlockedPromptException(), True),
+    (TimeoutError(), True),
+    (KeyError("id"), False),
+    (TypeError("bad kwargs"), False),
+    (APIError("not a status"), False),
+])
+def test_is_request_error(error, expected):
+    assert is_request_error(error) is expected
+
+
+def test_resilient_model_retries_transient_errors_only():
+    inner = FlakyModel([APIError(503), APIError(429)])
+    model = ResilientModel(inner, max_retries=3, base_delay=0)
+    assert model.generate_content("p").text == "ok:p"
+    assert inner.calls == 3
+    assert model.stats()["retries"] == 2 and model.stats()["throttled"] == 1
+
+    inner = FlakyModel([APIError(400)])
+    with pytest.raises(APIError):
+        ResilientModel(inner, max_retries=3, base_delay=0).generate_content("p")
+    assert inner.calls == 1
+
+    inner = FlakyModel([APIError(503)] * 5)
+    with pytest.raises(APIError):
+        ResilientModel(inner, max_retries=2, base_delay=0).generate_content("p")
+    assert inner.calls == 3
+
+
+def test_admission_caps_concurrent_calls():
+    admission = Admission(max_concurrency=2)
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def call(prompt):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.02)
+        with lock:
+            state["now"] -= 1
+        return TextResponse(prompt)
+
+    threads = [threading.Thread(target=admission.call, args=(call, "p", {})) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert state["peak"] == 2
+    assert admission.limiter.inflight == 0
+
+
+def test_admission_without_blocking_rolls_back_partial_grants():
+    admission = Admission(rpm=60, tpm=1000, max_concurrency=1)
+    assert admission.acquire(10)
+    level = (admission.requests.level, admission.tokens.level)
+    assert not admission.acquire(10, block=False)
+    # the request and token units taken before the full slot was seen are refunded
+    assert admission.requests.level == pytest.approx(level[0], abs=0.01)
+    assert admission.tokens.level == pytest.approx(level[1], abs=0.5)
+    admission.release(10, TextResponse("x"))
+    assert admission.acquire(10, block=False)
+
+
+def test_throttling_halves_the_concurrency_limit():
+    admission = Admission(max_concurrency=8)
+    admission.acquire(1)
+    admission.release(1, error=APIError(429))
+    assert admission.limiter.limit == 4
+    # one cut per cooldown window
+    admission.acquire(1)
+    admission.release(1, error=APIError(429))
+    assert admission.limiter.limit == 4
+
+
+def run_args(*argv):
+    ap = argparse.ArgumentParser()
+    add_run_args(ap)
+    return ap.parse_args(list(argv))
+
+
+class PerPromptModel:
+    def __init__(self, errors):
+        self.errors = errors
+
+    def generate_content(self, prompt, **kwargs):
+        if prompt in self.errors:
+            raise self.errors[prompt]
+        return TextResponse(f"review of {prompt}")
+
+
+def test_generate_reviews_dead_letters_request_errors(tmp_path):
+    dead = tmp_path / "dead.jsonl"
+    model = PerPromptModel({"p1": APIError(400), "p2": BlockedPromptException("safety")})
+    reqs = [(f"p{i}", {"id": str(i)}) for i in range(4)]
+    out = list(generate_reviews(model, reqs, run_args("--dead_letter", str(dead), "--concurrency", "2")))
+    assert [(payload["id"], text) for payload, text in out] == [("0", "review of p0"), ("3", "review of p3")]
+    records = [json.loads(line) for line in dead.read_text(encoding="utf-8").splitlines()]
+    assert sorted((r["id"], r["error"]) for r in records) == [("1", "APIError"), ("2", "BlockedPromptException")]
+
+
+def test_generate_reviews_raises_bugs():
+    model = PerPromptModel({"p1": KeyError("prompt")})
+    with pytest.raises(KeyError):
+        list(generate_reviews(model, [("p0", {"id": "0"}), ("p1", {"id": "1"})], run_args()))
+
+
+def test_dead_letter_without_path_only_counts(capsys):
+    dead = DeadLetter()
+    dead.record(("baseline", {"id": 7}), RequestError("nothing to review"))
+    dead.report()
+    err = capsys.readouterr().err
+    assert dead.count == 1
+    assert "id=7 failed permanently: RequestError: nothing to review" in err
+    assert "rerun with --resume" in err
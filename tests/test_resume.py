@@ -0,0 +1,60 @@
+import json
+
+from clarify_pr import baseline
+from clarify_pr.review_runner import combined_progress
+from clarify_pr.run_utils import completed_ids, iter_output
+
+FAKE = "fake:latency=fixed,latency_ms=0,seed=1"
+
+
+def write_lines(path, lines, tail=""):
+    path.write_text("".join(json.dumps(obj) + "\n" for obj in lines) + tail, encoding="utf-8")
+    return str(path)
+
+
+def test_torn_final_line_is_truncated(tmp_path, capsys):
+    path = write_lines(tmp_path / "out.jsonl", [{"id": "1"}, {"id": "2"}], tail='{"id": "3", "basel')
+    size = (tmp_path / "out.jsonl").stat().st_size
+    assert [obj["id"] for obj in iter_output(path)] == ["1", "2"]
+    assert (tmp_path / "out.jsonl").read_text(encoding="utf-8").endswith('{"id": "2"}\n')
+    assert (tmp_path / "out.jsonl").stat().st_size < size
+    assert "Truncating torn final line" in capsys.readouterr().err
+
+
+def test_bad_complete_line_is_skipped_not_truncated(tmp_path, capsys):
+    path = write_lines(tmp_path / "out.jsonl", [{"id": "1"}], tail='not json\n{"id": "2"}\n')
+    assert [obj["id"] for obj in iter_output(path)] == ["1", "2"]
+    assert "Bad JSON" in capsys.readouterr().err
+    assert "not json" in (tmp_path / "out.jsonl").read_text(encoding="utf-8")
+
+
+def test_completed_ids_skip_truncated_reviews(tmp_path):
+    path = write_lines(tmp_path / "out.jsonl", [{"id": 1}, {"id": 2, "truncated": True}, {"id": 3}])
+    assert completed_ids(path) == {"1", "3"}
+    assert completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_resume_reviews_only_missing_ids(tmp_path):
+    prs = write_lines(tmp_path / "prs.jsonl", [{"id": i, "prompt": f"PR {i}"} for i in range(5)])
+    out = tmp_path / "baseline.jsonl"
+    # a crashed run: two reviews, one cut off, and a torn line
+    write_lines(out, [{"id": "0", "baseline_review": "old"},
+                      {"id": "1", "baseline_review": "cut", "truncated": True},
+                      {"id": "2", "baseline_review": "old"}], tail='{"id": "3", "baseline_rev')
+    baseline.main(["--input", prs, "--output", str(out), "--model", FAKE, "--no_cache", "--resume"])
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in rows] == ["0", "1", "2", "1", "3", "4"]
+    assert [r["baseline_review"] for r in rows[:3]] == ["old", "cut", "old"]
+    assert completed_ids(str(out)) == {"0", "1", "2", "3", "4"}
+
+
+def test_combined_progress_merges_rows_and_skips_truncated(tmp_path):
+    path = write_lines(tmp_path / "both.jsonl", [
+        {"id": "1", "baseline_review": "b"},
+        {"id": "1", "clarified_review": "c"},
+        {"id": "2", "baseline_review": "b", "clarified_review": "c", "clarified_truncated": True},
+        {"id": "3", "baseline_review": "b", "clarified_review": "c"},
+    ])
+    done, partial = combined_progress(path)
+    assert done == {"baseline": {"1", "2", "3"}, "clarified": {"1", "3"}}
+    assert set(partial) == {"2"}
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from clarify_pr import sharding
+from clarify_pr.sharding import merge_jsonl, merge_tsv, shard_of, take_shard
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return str(path)
+
+
+def write_shards(tmp_path, rows, count):
+    paths = []
+    for i in range(count):
+        paths.append(write_jsonl(tmp_path / f"out.{i}.jsonl", take_shard(rows, i, count)))
+    return paths
+
+
+def test_shards_partition_the_input():
+    rows = [{"id": i} for i in range(50)]
+    shards = [list(take_shard(rows, i, 3)) for i in range(3)]
+    assert sorted(r["id"] for shard in shards for r in shard) == list(range(50))
+    assert all(shard_of(r["id"], 3) == i for i, shard in enumerate(shards) for r in shard)
+    assert list(take_shard(rows, 0, 1)) == rows
+    with pytest.raises(SystemExit):
+        take_shard(rows, 3, 3)
+
+
+def test_jsonl_merge_matches_an_unsharded_run(tmp_path):
+    rows = [{"id": str(i), "review": f"r{i} é"} for i in range(20)]
+    reference = write_jsonl(tmp_path / "prs.jsonl", [{"id": i} for i in range(20)])
+    write_jsonl(tmp_path / "all.jsonl", rows)
+    out = tmp_path / "merged.jsonl"
+    sharding.main(write_shards(tmp_path, rows, 3) + ["--output", str(out), "--reference", reference, "--strict"])
+    assert out.read_bytes() == (tmp_path / "all.jsonl").read_bytes()
+
+
+def test_jsonl_merge_keeps_the_last_copy_and_reports_duplicates(tmp_path):
+    a = write_jsonl(tmp_path / "a.jsonl", [{"id": "1", "v": "a"}, {"id": "2", "v": "a"}, {"id": "1", "v": "a2"}])
+    b = write_jsonl(tmp_path / "b.jsonl", [{"id": "2", "v": "b"}, {"id": "10", "v": "b"}])
+    out = tmp_path / "merged.jsonl"
+    wrote, dups, present = merge_jsonl([a, b], [], str(out))
+    assert wrote == 3 and present == {"1", "2", "10"}
+    # a redone line inside one shard is not a duplicate; the same id in two shards is
+    assert dups == {"2": 2}
+    assert [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()] == [
+        {"id": "1", "v": "a2"}, {"id": "2", "v": "b"}, {"id": "10", "v": "b"}]
+
+
+def test_strict_merge_fails_on_missing_and_extra_ids(tmp_path, capsys):
+    reference = write_jsonl(tmp_path / "prs.jsonl", [{"id": 1}, {"id": 2}])
+    shard = write_jsonl(tmp_path / "s.jsonl", [{"id": "1"}, {"id": "3"}])
+    out = tmp_path / "merged.jsonl"
+    with pytest.raises(SystemExit):
+        sharding.main([shard, "--output", str(out), "--reference", reference, "--strict"])
+    err = capsys.readouterr().err
+    assert "1 ids from" in err and "missing: 2" in err
+    assert "not in" in err and "left out: 3" in err
+    assert out.read_text(encoding="utf-8") == '{"id": "1"}\n'
+
+
+def test_tsv_merge_orders_by_reference_and_checks_headers(tmp_path):
+    a = tmp_path / "a.tsv"
+    b = tmp_path / "b.tsv"
+    a.write_text("id\tq\n2\tx\n", encoding="utf-8")
+    b.write_text("id\tq\n1\ty\n2\tz\n", encoding="utf-8")
+    out = tmp_path / "merged.tsv"
+    wrote, dups, _ = merge_tsv([str(a), str(b)], ["2", "1"], str(out))
+    assert wrote == 2 and dups == {"2": 2}
+    assert out.read_text(encoding="utf-8").splitlines() == ["id\tq", "2\tz", "1\ty"]
+    b.write_text("id\tother\n1\ty\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        merge_tsv([str(a), str(b)], [], str(out))